@@ -0,0 +1,106 @@
+import numpy as np
+from numpy.lib.recfunctions import repack_fields
+
+from ecoledirecte import BaseSession
+
+NOTE_DTYPE = np.dtype([
+    ("account", "i8"),
+    ("subject", "U64"),
+    ("period", "U64"),
+    ("periodIndex", "i4"),
+    ("note", "f8"),
+    ("coef", "f8"),
+    ("classAverage", "f8"),
+    ("classMin", "f8"),
+    ("classMax", "f8"),
+])
+
+
+def _nan(value):
+    return np.nan if value is None else value
+
+
+def toArray(notes, account: int = 0):
+    periods = {}
+    a = np.empty(len(notes), NOTE_DTYPE)
+    for i, n in enumerate(notes):
+        a[i] = (account, n.subject, n.period.name, periods.setdefault(n.period.name, len(periods)), _nan(n.note),
+                float(str(n.coef).replace(",", ".") or 0), _nan(n.moyenneClass), _nan(n.moyenneClassMin),
+                _nan(n.moyenneClassMax))
+    return a
+
+
+def collect(sources):
+    arrays = []
+    for source in sources:
+        if isinstance(source, BaseSession):
+            arrays.append(toArray(source.getNotes(), source.id))
+        else:
+            account, notes = source
+            arrays.append(toArray(notes, account))
+    return np.concatenate(arrays) if arrays else np.empty(0, NOTE_DTYPE)
+
+
+def _groups(a, by):
+    return np.unique(repack_fields(a[list(by)]), return_inverse=True)
+
+
+def _withColumns(keys, **columns):
+    r = np.empty(len(keys), keys.dtype.descr + [(name, "f8") for name in columns])
+    for name in keys.dtype.names:
+        r[name] = keys[name]
+    for name, values in columns.items():
+        r[name] = values
+    return r
+
+
+def weightedAverages(a, by=("account",)):
+    keys, inverse = _groups(a, by)
+    inverse = inverse.ravel()
+    mask = ~np.isnan(a["note"]) & (a["coef"] > 0)
+
+    total = np.bincount(inverse[mask], a["note"][mask] * a["coef"][mask], len(keys))
+    coefs = np.bincount(inverse[mask], a["coef"][mask], len(keys))
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return _withColumns(keys, average=np.where(coefs > 0, total / coefs, np.nan))
+
+
+def subjectRanking(a):
+    r = weightedAverages(a, ("subject", "account"))
+    _, subjects = np.unique(r["subject"], return_inverse=True)
+    subjects = subjects.ravel()
+
+    order = np.lexsort((-r["average"], subjects))
+    starts = np.searchsorted(subjects[order], subjects[order])
+
+    rank = np.empty(len(r))
+    rank[order] = np.arange(len(r)) - starts + 1
+
+    return _withColumns(repack_fields(r[["subject", "account"]]), average=r["average"], rank=rank)
+
+
+def percentiles(a):
+    with np.errstate(invalid="ignore", divide="ignore"):
+        p = (a["note"] - a["classMin"]) / (a["classMax"] - a["classMin"]) * 100
+    return np.where(a["classMax"] > a["classMin"], np.clip(p, 0, 100), np.nan)
+
+
+def trends(a):
+    r = weightedAverages(a, ("account", "subject", "periodIndex"))
+    r = r[~np.isnan(r["average"])]
+    keys, inverse = _groups(r, ("account", "subject"))
+    inverse = inverse.ravel()
+
+    x = r["periodIndex"].astype("f8")
+    y = r["average"]
+    n = np.bincount(inverse, minlength=len(keys))
+    sx = np.bincount(inverse, x, len(keys))
+    sy = np.bincount(inverse, y, len(keys))
+    sxy = np.bincount(inverse, x * y, len(keys))
+    sxx = np.bincount(inverse, x * x, len(keys))
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        slope = np.where(n > 1, (n * sxy - sx * sy) / (n * sxx - sx * sx), np.nan)
+
+    return _withColumns(keys, slope=slope, periods=n)
@@ -0,0 +1,268 @@
+import asyncio
+from urllib.parse import urlparse
+
+import aiohttp
+
+from os import remove, replace
+from os.path import exists
+
+from codec import decode
+from ecoledirecte import BaseSession, IdentityMap, HOMEWORK_WORKERS, INVALID_TOKEN_CODES, dayRange, isoDay
+from errors import DownloadError, LoginError
+from transport import API_URL
+
+
+class AsyncResponse:
+    def __init__(self, status, headers, content):
+        self.status_code = status
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self):
+        return self.content.decode("utf8")
+
+
+class AsyncTransport:
+    def __init__(self, poolSize: int = 300, concurrency: int = 50, timeout=30, retries: int = 3, backoff: float = 0.5,
+                 apiUrl: str = None, headers: dict = None):
+        self.poolSize = poolSize
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.apiUrl = apiUrl
+        self.headers = {"Content-Type": "application/x-www-form-urlencoded", **(headers or {})}
+        self._http = None
+        self._semaphores = {}
+
+    def url(self, url: str):
+        if self.apiUrl and url.startswith(API_URL):
+            return self.apiUrl + url[len(API_URL):]
+        return url
+
+    def _session(self):
+        if self._http is None or self._http.closed:
+            self._http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.poolSize),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers=self.headers
+            )
+        return self._http
+
+    def _semaphore(self, url):
+        host = urlparse(url).netloc
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.concurrency)
+        return self._semaphores[host]
+
+    async def post(self, url: str, data, headers: dict = None):
+        url = self.url(url)
+        if isinstance(data, str):
+            data = data.encode("utf8")
+
+        async with self._semaphore(url):
+            for attempt in range(self.retries + 1):
+                try:
+                    async with self._session().post(url, data=data, headers=headers) as r:
+                        if r.status in (429, 500, 502, 503, 504) and attempt < self.retries:
+                            raise aiohttp.ClientResponseError(r.request_info, r.history, status=r.status)
+                        return AsyncResponse(r.status, r.headers, await r.read())
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    if attempt >= self.retries:
+                        raise
+                await asyncio.sleep(self.backoff * 2 ** attempt)
+
+    async def close(self):
+        if self._http is not None:
+            await self._http.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    def __repr__(self):
+        return f"<{self.__module__}.{self.__class__.__name__} {self.apiUrl or API_URL}>"
+
+
+class AsyncSession(BaseSession):
+    def __init__(self, transport: AsyncTransport = None):
+        self._ownTransport = transport is None
+        self.transport = transport or AsyncTransport()
+        self.people = IdentityMap()
+        self.hooks = {"before": [], "after": []}
+        self.homeworkDays = {}
+        self.token = None
+        self._credentials = (None, None)
+        self._loginLock = asyncio.Lock()
+
+    @classmethod
+    async def login(cls, username, password, transport: AsyncTransport = None):
+        self = cls(transport)
+        self._credentials = (username, password)
+
+        try:
+            await self._login()
+        except BaseException:
+            await self.close()
+            raise
+
+        return self
+
+    @classmethod
+    def restore(cls, state: dict, transport: AsyncTransport = None, username=None, password=None):
+        self = cls(transport)
+        self._credentials = (username, password)
+        self._loadDump(state)
+        return self
+
+    async def _login(self):
+        username, password = self._credentials
+        if username is None:
+            raise LoginError("Can't log in again without a username and password")
+
+        with self._instrument(API_URL + 'login.awp') as event:
+            self._loadAccount(await self._send(event, API_URL + 'login.awp', self._loginData(username, password)))
+
+    async def _relogin(self, token):
+        async with self._loginLock:
+            if self.token == token:
+                await self._login()
+
+    async def _post(self, url, data, **kwargs):
+        return await self.transport.post(url, data, **kwargs)
+
+    async def close(self):
+        if self._ownTransport:
+            await self.transport.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def _send(self, event, url, data):
+        r = await self._post(url, data)
+        event.status = r.status_code
+        event.size += len(r.content)
+        return decode(r.content)
+
+    async def _request(self, url, data: dict = None):
+        with self._instrument(url) as event:
+            token = self.token
+            r = await self._send(event, url, self._tokenData(data))
+
+            if r.get("code") in INVALID_TOKEN_CODES and self._credentials[0] is not None:
+                await self._relogin(token)
+                r = await self._send(event, url, self._tokenData(data))
+
+            return self._checkResponse(r)
+
+    async def _messageAction(self, ids, action, **kwargs):
+        return await self._request(API_URL + 'eleves/' + str(self.id) + '/messages.awp?verbe=put',
+                                   {"ids": list(ids), "action": action, **kwargs})
+
+    def invalidate(self, endpoint: str = None):
+        if endpoint in (None, "homeworksForDay"):
+            self.homeworkDays.clear()
+
+    async def _download(self, type, id):
+        with self._instrument(API_URL + 'telechargement.awp?verbe=get') as event:
+            token = self.token
+            r = await self._post(API_URL + 'telechargement.awp?verbe=get', self._downloadData(type, id))
+
+            error = self._downloadError(r)
+            if error is not None and error["code"] in INVALID_TOKEN_CODES and self._credentials[0] is not None:
+                await self._relogin(token)
+                r = await self._post(API_URL + 'telechargement.awp?verbe=get', self._downloadData(type, id))
+                error = self._downloadError(r)
+
+            event.status = r.status_code
+            event.size = len(r.content)
+            if error is not None:
+                raise DownloadError(f"Can't download {type} {id}: {error.get('message') or error['code']}")
+            if r.status_code >= 400:
+                raise DownloadError(f"Can't download {type} {id} (HTTP {r.status_code})")
+
+            return r.content
+
+    async def download(self, type, id, filename, progress=None, version=None, **kwargs):
+        content = await self._download(type, id)
+
+        part = filename + ".part"
+        try:
+            with open(part, "wb") as f:
+                f.write(content)
+        except BaseException:
+            if exists(part):
+                remove(part)
+            raise
+        replace(part, filename)
+
+        if progress:
+            progress(len(content), len(content))
+
+        return filename
+
+    async def loadFolder(self, folder, force: bool = False):
+        if folder.isLoaded and not force:
+            return folder
+
+        folder._setData((await self._request(folder._loadUrl()))[0])
+
+        return folder
+
+    async def loadAll(self, folder, force: bool = False):
+        level = [folder]
+        while level:
+            await asyncio.gather(*(self.loadFolder(f, force) for f in level))
+            level = [c for f in level for c in f.children if c.folder]
+
+        return folder
+
+    async def getHomeworks(self):
+        return self._makeHomeworks(await self._request(self._url("homeworks")))
+
+    async def getHomeworksForDay(self, day, refresh: bool = False):
+        day = isoDay(day)
+        homeworks = self._cachedDay(day, refresh)
+        if homeworks is None:
+            homeworks = self._storeDay(day, await self._request(self._url("homeworksForDay", day=day)))
+        return homeworks
+
+    async def getHomeworksRange(self, start, end, workers: int = HOMEWORK_WORKERS, refresh: bool = False):
+        limit = asyncio.Semaphore(workers)
+
+        async def fetch(day):
+            async with limit:
+                return await self.getHomeworksForDay(day, refresh)
+
+        days = dayRange(start, end)
+        return dict(zip(days, await asyncio.gather(*(fetch(d) for d in days))))
+
+    async def getNotes(self):
+        return self._makeNotes(await self._request(self._url("notes")))
+
+    async def getMessages(self):
+        return self._makeMessages(await self._request(self._url("messages")))
+
+    async def getPersonalCloud(self):
+        return self._makePersonalCloud(await self._request(self._url("personalCloud")))
+
+    async def getClouds(self):
+        return self._makeClouds(await self._request(self._url("clouds")))
+
+    async def getCloud(self, id: int):
+        return self._makeCloud(id, await self._request(self._url("cloud", cloudId=id)))
+
+    async def getDocuments(self):
+        return self._makeDocuments(await self._request(self._url("documents")))
+
+    async def getSchoolLife(self):
+        return self._makeSchoolLife(await self._request(self._url("schoolLife")))
+
+    async def getMoneyData(self):
+        return self._makeMoneyData(await self._request(self._url("moneyData")))
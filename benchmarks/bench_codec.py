@@ -0,0 +1,35 @@
+import sys
+from os.path import dirname, abspath
+from json import loads
+from timeit import repeat
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+import codec
+
+
+def messages(n):
+    person = {"nom": "DUPONT", "prenom": "Jean", "civilite": "M.", "id": 1, "role": "P"}
+    return {"code": 200, "message": "", "data": {"messages": {"received": [
+        {"id": i, "read": i % 2 == 0, "subject": f"Message n°{i} é à", "date": "2021-01-01 08:00:00",
+         "mtype": "received", "to": [person], "from": person,
+         "files": [{"id": i, "libelle": "pièce jointe.pdf", "date": "2021-01-01"}]} for i in range(n)
+    ]}}}
+
+
+def main():
+    content = codec.encode(messages(10000)).encode("utf8")
+    print(f"payload: {len(content) / 1024 ** 2:.1f} MiB")
+
+    best = min(repeat(lambda: loads(content.decode("utf8")), number=5, repeat=3)) / 5
+    print(f"{'old':>8}: {best * 1000:.1f} ms/decode")
+
+    backends = ["json"] + (["orjson"] if codec.orjson is not None else [])
+    for name in backends:
+        codec.use(name)
+        best = min(repeat(lambda: codec.decode(content), number=5, repeat=3)) / 5
+        print(f"{name:>8}: {best * 1000:.1f} ms/decode")
+
+
+if __name__ == "__main__":
+    main()
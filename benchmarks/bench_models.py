@@ -0,0 +1,154 @@
+import gc
+import sys
+import tracemalloc
+from argparse import ArgumentParser
+from json import load, dump
+from os.path import dirname, abspath, join, exists
+from timeit import timeit
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+from ecoledirecte import Session, IdentityMap, PersonalCloud, ACCOUNT_FIELDS
+from fakeserver import SyntheticAccount
+
+BASELINE = join(dirname(abspath(__file__)), "baseline.json")
+SCALES = (1, 10, 100)
+
+
+def account(scale):
+    return SyntheticAccount(messages=1000 * scale, subjects=10 * scale, periods=3, folders=100 * scale,
+                            filesPerFolder=5, branching=2, comptes=2, ecritures=500 * scale)
+
+
+def session():
+    return Session(state={**{f: None for f in ACCOUNT_FIELDS}, "id": 1, "token": "token-1"})
+
+
+def _files(folder):
+    for c in folder.children:
+        if c.folder:
+            yield from _files(c)
+        else:
+            yield c.getPath()
+
+
+def benchmarks(scale):
+    a = account(scale)
+    s = session()
+    messages = a.messageList()
+    notes = a.notes()
+    money = a.moneyData()
+    tree = a.cloudTree()
+
+    def buildNotes():
+        s.people = IdentityMap()
+        return [n.teachers for n in s._makeNotes(notes)]
+
+    noteList = s._makeNotes(notes)
+    cloud = PersonalCloud(s, tree)
+    paths = list(_files(cloud))
+
+    return {
+        "messages.init": lambda: s._makeMessages(messages),
+        "messages.iterate": lambda: list(s._makeMessages(messages)),
+        "notes.build": buildNotes,
+        "notes.bestsWorsts": lambda: (noteList.getBests(), noteList.getWorsts()),
+        "compte.flatten": lambda: s._makeMoneyData(money),
+        "cloud.build": lambda: PersonalCloud(s, tree),
+        "cloud.tree": cloud.tree,
+        "cloud.getFileByPath": lambda: [cloud.getFileByPath(p) for p in paths],
+    }
+
+
+def _calibration():
+    return sorted({"id": i, "name": str(i)}["name"] for i in range(20000))
+
+
+def measure(func, number, repeats):
+    seconds = calibration = float("inf")
+    for _ in range(repeats):
+        calibration = min(calibration, timeit(_calibration, number=1))
+        seconds = min(seconds, timeit(func, number=number) / number)
+
+    func()
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"seconds": seconds, "relative": seconds / calibration, "peak": peak, "number": number, "repeat": repeats}
+
+
+def run(scales, only=None, number=3, repeats=5):
+    for scale in scales:
+        for name, func in benchmarks(scale).items():
+            if only and not any(o in name for o in only):
+                continue
+            yield f"{name}@{scale}x", measure(func, number, repeats)
+
+
+def comparable(result, baseline):
+    return all(result[k] == baseline.get(k) for k in ("number", "repeat"))
+
+
+def compare(result, baseline, tolerances, timeFloor=0.):
+    regressions = []
+    for field, tolerance in tolerances.items():
+        if field == "relative" and result["seconds"] - baseline["seconds"] <= timeFloor:
+            continue
+        if baseline.get(field) and result[field] > baseline[field] * (1 + tolerance):
+            regressions.append(f"{field} {result[field] / baseline[field]:.2f}x")
+    return regressions
+
+
+def main():
+    parser = ArgumentParser(description="Time and peak memory of model construction and cloud traversal")
+    parser.add_argument("--scales", type=int, nargs="+", default=SCALES)
+    parser.add_argument("--only", nargs="+", help="Only run benchmarks whose name contains one of these")
+    parser.add_argument("--number", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save", action="store_true", help="Store the results as the new baseline")
+    parser.add_argument("--time-tolerance", type=float, default=0.5,
+                        help="Allowed slowdown relative to a calibration loop timed alongside each benchmark")
+    parser.add_argument("--time-floor", type=float, default=0.002,
+                        help="Ignore slowdowns smaller than this many seconds per call")
+    parser.add_argument("--memory-tolerance", type=float, default=0.1)
+    args = parser.parse_args()
+
+    baseline = {}
+    if exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = load(f)
+
+    results = {}
+    failed = []
+    skipped = []
+    for key, r in run(args.scales, args.only, args.number, args.repeat):
+        results[key] = r
+        line = f"{key:<28} {r['seconds'] * 1000:>10.2f} ms {r['peak'] / 1024:>12.1f} KiB"
+        if key in baseline and not args.save and not comparable(r, baseline[key]):
+            skipped.append(key)
+            line += "  NOT COMPARED (baseline used other --number/--repeat)"
+        elif key in baseline and not args.save:
+            regressions = compare(r, baseline[key], {"relative": args.time_tolerance, "peak": args.memory_tolerance},
+                                  args.time_floor)
+            if regressions:
+                failed.append(key)
+                line += "  REGRESSION " + ", ".join(regressions)
+        print(line)
+
+    if args.save:
+        with open(args.baseline, "w") as f:
+            dump({**baseline, **results}, f, indent=2, sort_keys=True)
+        print(f"Baseline saved to {args.baseline}")
+    elif failed:
+        print(f"{len(failed)} regression(s) against {args.baseline}")
+        sys.exit(1)
+    elif skipped:
+        print(f"{len(skipped)} result(s) not compared: run with the baseline's --number and --repeat")
+
+
+if __name__ == "__main__":
+    main()
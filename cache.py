@@ -0,0 +1,274 @@
+from collections import OrderedDict
+from hashlib import sha256
+from hmac import new as hmac
+from os import makedirs, getpid, link, listdir, remove, replace, urandom
+from os.path import join, exists, getsize
+from shutil import copyfile
+from threading import Lock, get_ident
+from time import time
+
+from codec import decode, encode
+from jsonfile import readJSON, writeJSON
+
+
+def _hash(filename):
+    h = sha256()
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _place(source, destination, hardLink):
+    if exists(destination):
+        remove(destination)
+    if hardLink:
+        try:
+            link(source, destination)
+            return
+        except OSError:
+            pass
+    copyfile(source, destination)
+
+
+class DownloadCache:
+    def __init__(self, directory: str, maxSize: int = 1024 ** 3, hardLink: bool = False):
+        self.directory = directory
+        self.maxSize = maxSize
+        self.hardLink = hardLink
+        self.hits = 0
+        self.misses = 0
+        self._lock = Lock()
+
+        makedirs(join(directory, "objects"), exist_ok=True)
+
+        self._indexFile = join(directory, "index.json")
+        index = readJSON(self._indexFile, {"keys": {}, "objects": {}})
+        self._keys = index["keys"]
+        self._objects = index["objects"]
+
+    @staticmethod
+    def key(type, id, version=None):
+        return f"{type}:{id}:{'' if version is None else version}"
+
+    def _path(self, hash):
+        return join(self.directory, "objects", hash[:2], hash)
+
+    def _save(self):
+        writeJSON(self._indexFile, {"keys": self._keys, "objects": self._objects})
+
+    @property
+    def size(self):
+        return sum(o["size"] for o in self._objects.values())
+
+    def get(self, type, id, version, filename):
+        key = self.key(type, id, version)
+
+        with self._lock:
+            hash = self._keys.get(key)
+            if hash is not None and self.hardLink and exists(self._path(hash)) and _hash(self._path(hash)) != hash:
+                remove(self._path(hash))
+                self._objects.pop(hash, None)
+            if hash is None or not exists(self._path(hash)):
+                self.misses += 1
+                return False
+
+            _place(self._path(hash), filename, self.hardLink)
+            self._objects[hash]["atime"] = time()
+            self.hits += 1
+            self._save()
+
+        return True
+
+    def put(self, type, id, version, filename):
+        tmp = join(self.directory, "objects", f"{getpid()}.{get_ident()}.tmp")
+        copyfile(filename, tmp)
+        hash = _hash(tmp)
+        path = self._path(hash)
+
+        with self._lock:
+            if exists(path):
+                remove(tmp)
+            else:
+                makedirs(join(self.directory, "objects", hash[:2]), exist_ok=True)
+                replace(tmp, path)
+
+            self._keys[self.key(type, id, version)] = hash
+            self._objects[hash] = {"size": getsize(path), "atime": time()}
+            self._evict()
+            self._save()
+
+    def _evict(self):
+        size = self.size
+        for hash, o in sorted(self._objects.items(), key=lambda i: i[1]["atime"]):
+            if size <= self.maxSize:
+                break
+            if exists(self._path(hash)):
+                remove(self._path(hash))
+            del self._objects[hash]
+            size -= o["size"]
+
+        self._keys = {k: h for k, h in self._keys.items() if h in self._objects}
+
+    def clear(self):
+        with self._lock:
+            for hash in self._objects:
+                if exists(self._path(hash)):
+                    remove(self._path(hash))
+            self._keys = {}
+            self._objects = {}
+            self._save()
+
+    def __repr__(self):
+        return f"<{self.__module__}.{self.__class__.__name__} {self.directory} {self.hits} hits {self.misses} misses>"
+
+
+class MemoryCache:
+    def __init__(self, maxEntries: int = 1024):
+        self.maxEntries = maxEntries
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            value = entry[1]
+        return decode(value)
+
+    def set(self, key, value, ttl):
+        value = encode(value)
+        with self._lock:
+            self._entries[key] = (time() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxEntries:
+                self._entries.popitem(last=False)
+
+    def delete(self, prefix=""):
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class DiskCache:
+    def __init__(self, directory: str):
+        self.directory = directory
+        makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return join(self.directory, sha256(key.encode("utf8")).hexdigest() + ".json")
+
+    def get(self, key):
+        path = self._path(key)
+        entry = readJSON(path)
+        if entry is None:
+            return None
+        if entry["expires"] < time():
+            try:
+                remove(path)
+            except FileNotFoundError:
+                pass
+            return None
+        return entry["value"]
+
+    def set(self, key, value, ttl):
+        writeJSON(self._path(key), {"key": key, "expires": time() + ttl, "value": value})
+
+    def delete(self, prefix=""):
+        for name in listdir(self.directory):
+            path = join(self.directory, name)
+            entry = readJSON(path)
+            if entry is not None and entry["key"].startswith(prefix):
+                try:
+                    remove(path)
+                except FileNotFoundError:
+                    pass
+
+    def __len__(self):
+        return len(listdir(self.directory))
+
+
+class ResponseCache:
+    def __init__(self, backend=None, ttl: float = 300, ttls: dict = None):
+        self.backend = backend if backend is not None else MemoryCache()
+        self.ttl = ttl
+        self.ttls = ttls or {}
+        self.stats = {}
+        self._lock = Lock()
+
+    def _count(self, endpoint, hit):
+        with self._lock:
+            stats = self.stats.setdefault(endpoint, {"hits": 0, "misses": 0})
+            stats["hits" if hit else "misses"] += 1
+
+    @property
+    def hits(self):
+        return sum(s["hits"] for s in self.stats.values())
+
+    @property
+    def misses(self):
+        return sum(s["misses"] for s in self.stats.values())
+
+    def get(self, key, endpoint):
+        value = self.backend.get(key)
+        self._count(endpoint, value is not None)
+        return value
+
+    def set(self, key, endpoint, value):
+        ttl = self.ttls.get(endpoint, self.ttl)
+        if ttl > 0:
+            self.backend.set(key, value, ttl)
+
+    def invalidate(self, prefix=""):
+        self.backend.delete(prefix)
+
+    def __repr__(self):
+        return f"<{self.__module__}.{self.__class__.__name__} {len(self.backend)} entries {self.hits} hits " \
+               f"{self.misses} misses>"
+
+
+class TokenStore:
+    def __init__(self, directory: str):
+        self.directory = directory
+        makedirs(directory, mode=0o700, exist_ok=True)
+        self._key = self._loadKey()
+
+    def _loadKey(self):
+        path = join(self.directory, ".key")
+        if not exists(path):
+            tmp = f"{path}.{getpid()}.{get_ident()}.tmp"
+            writeJSON(tmp, urandom(32).hex(), mode=0o600)
+            try:
+                link(tmp, path)
+            except FileExistsError:
+                pass
+            finally:
+                remove(tmp)
+
+        return bytes.fromhex(readJSON(path))
+
+    def _path(self, username, password):
+        return join(self.directory, hmac(self._key, f"{username}\0{password}".encode("utf8"), sha256).hexdigest() +
+                    ".json")
+
+    def get(self, username, password):
+        return readJSON(self._path(username, password))
+
+    def set(self, username, password, state: dict):
+        writeJSON(self._path(username, password), state, mode=0o600)
+
+    def delete(self, username, password):
+        path = self._path(username, password)
+        if exists(path):
+            remove(path)
+
+    def __repr__(self):
+        return f"<{self.__module__}.{self.__class__.__name__} {self.directory}>"
@@ -0,0 +1,100 @@
+from hashlib import blake2b
+
+from jsonfile import readJSON, writeJSON
+
+
+def fingerprint(*values):
+    return blake2b(repr(values).encode("utf8"), digest_size=8).hexdigest()
+
+
+def _notes(notes):
+    for n in notes:
+        yield f"{n.period.name}/{n.subject}", n, fingerprint(n.note, n.moyenneClass, n.moyenneClassMin,
+                                                             n.moyenneClassMax, n.coef)
+
+
+def _schoolLife(items):
+    for i in items:
+        yield f"{i.__class__.__name__}/{i.id}", i, fingerprint(i.__class__.__name__, i.justified, i.motif, i.duration, i.date, i.comment)
+
+
+def _money(comptes):
+    for c in comptes:
+        yield str(c.id), c, fingerprint(c.money, c.name)
+
+        seen = {}
+        for l in c.logs:
+            key = f"{c.id}/{l.date}/{l.name}"
+            seen[key] = seen.get(key, 0) + 1
+            yield f"{key}/{seen[key]}", l, fingerprint(l.money)
+
+
+CATEGORIES = {
+    "notes": ("getNotes", _notes),
+    "schoolLife": ("getSchoolLife", _schoolLife),
+    "money": ("getMoneyData", _money),
+}
+
+
+class Change:
+    __slots__ = ("kind", "category", "key", "item")
+
+    def __init__(self, kind, category, key, item=None):
+        self.kind = kind
+        self.category = category
+        self.key = key
+        self.item = item
+
+    def __repr__(self):
+        return f"<{self.__module__}.{self.__class__.__name__} {self.kind} {self.category} {self.key}>"
+
+
+class ChangeFeed:
+    def __init__(self, session, path: str = None):
+        self.session = session
+        self.path = path
+        self.fingerprints = {}
+
+        state = readJSON(path) if path is not None else None
+        if state is not None and state["account"] == session.id:
+            self.fingerprints = state["fingerprints"]
+
+    def save(self):
+        writeJSON(self.path, {"account": self.session.id, "fingerprints": self.fingerprints})
+
+    def reset(self, category: str = None):
+        if category is None:
+            self.fingerprints = {}
+        else:
+            self.fingerprints.pop(category, None)
+
+    def diff(self, category: str, items):
+        known = self.fingerprints.get(category, {})
+        current = {}
+        changes = []
+
+        for key, item, fp in CATEGORIES[category][1](items):
+            current[key] = fp
+            previous = known.get(key)
+            if previous is None:
+                changes.append(Change("added", category, key, item))
+            elif previous != fp:
+                changes.append(Change("changed", category, key, item))
+
+        for key in known:
+            if key not in current:
+                changes.append(Change("removed", category, key))
+
+        self.fingerprints[category] = current
+        return changes
+
+    def poll(self, categories=None, save: bool = True):
+        changes = []
+        for category in categories or CATEGORIES:
+            getter = getattr(self.session, CATEGORIES[category][0])
+            changes += self.diff(category, getter(refresh=True))
+
+        if save and self.path is not None:
+            self.save()
+
+        return changes
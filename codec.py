@@ -0,0 +1,34 @@
+from json import loads as _loads, dumps as _dumps
+from urllib.parse import urlencode
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+backend = "orjson" if orjson is not None else "json"
+
+
+def use(name: str):
+    global backend
+    if name == "orjson" and orjson is None:
+        raise ImportError("orjson is not installed")
+    if name not in ("json", "orjson"):
+        raise ValueError(f"Unknown JSON backend {name!r}")
+    backend = name
+
+
+def decode(content):
+    if backend == "orjson":
+        return orjson.loads(content)
+    return _loads(content)
+
+
+def encode(data) -> str:
+    if backend == "orjson":
+        return orjson.dumps(data).decode("utf8")
+    return _dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def payload(data) -> str:
+    return urlencode({"data": encode(data)})
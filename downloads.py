@@ -0,0 +1,167 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from os import makedirs, remove
+from os.path import dirname, exists, join, splitext, getsize
+from time import perf_counter, sleep
+
+from jsonfile import readJSON, writeJSON
+
+
+def _safeName(name):
+    name = name.replace("/", "_").replace("\\", "_").strip()
+    return "_" if name in ("", ".", "..") else name
+
+
+def _unique(name, id, used):
+    if name.lower() in used:
+        root, ext = splitext(name)
+        name = f"{root} ({id}){ext}"
+    used.add(name.lower())
+    return name
+
+
+class DownloadReport:
+    def __init__(self):
+        self.downloaded = []
+        self.failed = []
+        self.duplicates = 0
+        self.bytes = 0
+        self.elapsed = 0.
+
+    @property
+    def ok(self):
+        return not self.failed
+
+    def __repr__(self):
+        return f"<{self.__module__}.{self.__class__.__name__} {len(self.downloaded)} downloaded, " \
+               f"{len(self.failed)} failed, {self.duplicates} duplicates, {self.bytes} bytes " \
+               f"({self.elapsed:.2f}s)>"
+
+
+class DownloadManager:
+    def __init__(self, directory: str = "downloads", workers: int = 4, retries: int = 2, backoff: float = 1.):
+        self.directory = directory
+        self.workers = workers
+        self.retries = retries
+        self.backoff = backoff
+        self.items = {}
+        self.duplicates = 0
+        self._names = set()
+
+    def _target(self, item):
+        return join(self.directory, _unique(_safeName(item.filename), item.id, self._names))
+
+    def add(self, *items):
+        for item in items:
+            self.addAs(item, None)
+
+        return self
+
+    def addAs(self, item, filename):
+        key = (item.fileType, item.id)
+        if key in self.items:
+            self.duplicates += 1
+        else:
+            self.items[key] = (item, filename or self._target(item))
+
+        return self
+
+    def _download(self, item, filename):
+        for attempt in range(self.retries + 1):
+            try:
+                return item.download(filename)
+            except Exception:
+                if attempt >= self.retries:
+                    raise
+                sleep(self.backoff * 2 ** attempt)
+
+    def run(self, progress=None):
+        makedirs(self.directory, exist_ok=True)
+        for _, filename in self.items.values():
+            makedirs(dirname(filename) or ".", exist_ok=True)
+
+        report = DownloadReport()
+        report.duplicates = self.duplicates
+        start = perf_counter()
+
+        with ThreadPoolExecutor(self.workers) as executor:
+            futures = {executor.submit(self._download, item, filename): item
+                       for item, filename in self.items.values()}
+
+            for future in as_completed(futures):
+                item = futures[future]
+                try:
+                    filename = future.result()
+                except Exception as e:
+                    report.failed.append((item, e))
+                else:
+                    report.downloaded.append((item, filename))
+                    report.bytes += getsize(filename)
+
+                if progress:
+                    progress(len(report.downloaded) + len(report.failed), len(futures), item)
+
+        report.elapsed = perf_counter() - start
+
+        return report
+
+
+MANIFEST = ".ecoledirecte-manifest.json"
+
+
+class MirrorReport:
+    def __init__(self):
+        self.downloaded = []
+        self.unchanged = 0
+        self.removed = []
+        self.failed = []
+
+    def __repr__(self):
+        return f"<{self.__module__}.{self.__class__.__name__} {len(self.downloaded)} downloaded, " \
+               f"{self.unchanged} unchanged, {len(self.removed)} removed, {len(self.failed)} failed>"
+
+
+def mirror(cloud, directory: str, delete: bool = False, workers: int = 4, retries: int = 2):
+    manifestFile = join(directory, MANIFEST)
+    manifest = readJSON(manifestFile, {})
+
+    cloud.reloadAll(workers)
+
+    report = MirrorReport()
+    manager = DownloadManager(directory, workers, retries)
+    current = {}
+    folders = [(cloud, ())]
+    while folders:
+        folder, parts = folders.pop()
+        used = set()
+        for c in folder.children:
+            name = _unique(_safeName(c.name), c.id, used)
+            if c.folder:
+                folders.append((c, parts + (name,)))
+                continue
+
+            path = "/".join(parts + (name,))
+            current[path] = {"id": c.id, "size": c.size}
+            if manifest.get(path) == current[path] and exists(join(directory, *path.split("/"))):
+                report.unchanged += 1
+            else:
+                manager.addAs(c, join(directory, *path.split("/")))
+
+    r = manager.run()
+    report.downloaded = r.downloaded
+    report.failed = r.failed
+    failed = {(i.fileType, i.id) for i, _ in r.failed}
+
+    for path in list(manifest):
+        if path not in current:
+            report.removed.append(path)
+            if delete and exists(join(directory, *path.split("/"))):
+                remove(join(directory, *path.split("/")))
+            del manifest[path]
+
+    for path, entry in current.items():
+        if ("CLOUD", entry["id"]) not in failed:
+            manifest[path] = entry
+
+    writeJSON(manifestFile, manifest)
+
+    return report
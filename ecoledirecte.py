@@ -1,13 +1,35 @@
-from json import loads, dumps
-from os import mkdir
-from os.path import exists
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date, timedelta
+from heapq import nlargest, nsmallest
+from inspect import iscoroutinefunction
+from logging import getLogger
+from os import mkdir, remove, replace
+from os.path import exists, getsize
 from random import choice
-from typing import List
+from threading import Lock
+from time import perf_counter, time
 from urllib.parse import urlencode
 
-from requests import post
+from errors import DownloadError, LoginError, APIError, EcoleDirecteError
+from cache import DownloadCache, ResponseCache, TokenStore
+from codec import decode, payload
+from downloads import mirror
+from metrics import RequestEvent
+from transport import API_URL, Transport
 
-from errors import DownloadError, LoginError, APIError
+CRAWL_WORKERS = 4
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+MESSAGE_BATCH_SIZE = 100
+HOMEWORK_WORKERS = 8
+HOMEWORK_TTL = 300
+
+logger = getLogger(__name__)
+
+
+def _completeLength(r):
+    value = r.headers.get("Content-Range", "")
+    return int(value[len("bytes */"):]) if value.startswith("bytes */") else None
 
 
 def _toFloat(data: str):
@@ -15,6 +37,8 @@ def _toFloat(data: str):
 
 
 class Teacher:
+    __slots__ = ("sex", "name", "surname", "isHeadTeacher", "subject")
+
     def __init__(self, name, subject=None, isHeadTeacher=False):
         if name.startswith("Mme"):
             self.sex = 0
@@ -36,6 +60,8 @@ class Teacher:
 
 
 class Homework:
+    __slots__ = ("date", "subject", "done", "giveThe")
+
     def __init__(self, date, data):
         self.date = date
         self.subject = data["matiere"]
@@ -46,37 +72,168 @@ class Homework:
         return "Pour le " + self.date + ", matière : " + self.subject + (" (Finit)" if self.done else "")
 
 
+def isoDay(day):
+    return day if isinstance(day, str) else date.isoformat(day)
+
+
+def dayRange(start, end):
+    start = date.fromisoformat(start) if isinstance(start, str) else start
+    end = date.fromisoformat(end) if isinstance(end, str) else end
+    return [(start + timedelta(i)).isoformat() for i in range((end - start).days + 1)]
+
+
+class SubjectStats:
+    def __init__(self, subject, notes):
+        graded = [n for n in notes if n.note is not None]
+        coefs = sum(_toFloat(str(n.coef)) or 0 for n in graded)
+
+        self.subject = subject
+        self.count = len(graded)
+        self.average = sum(n.note for n in graded) / len(graded) if graded else None
+        self.weightedAverage = sum(n.note * (_toFloat(str(n.coef)) or 0) for n in graded) / coefs if coefs else None
+        self.min = min((n.note for n in graded), default=None)
+        self.max = max((n.note for n in graded), default=None)
+
+    def __repr__(self):
+        return f"<{self.__module__}.{self.__class__.__name__} {self.subject}: {self.count} notes, moyenne {self.average}>"
+
+
+NOTE_INDEXES = {
+    "subject": lambda n: (n.subject,),
+    "period": lambda n: (n.period.name,),
+    "teacher": lambda n: n.professors,
+}
+
+
 class NoteList(list):
-    def getBests(self):
-        best = 0
-        for n in self:
-            if n.note is None:
-                continue
-            if n.note > best:
-                best = n.note
+    @property
+    def _memo(self):
+        return self.__dict__.setdefault("_cache", {})
+
+    def _invalidate(self):
+        self.__dict__.pop("_cache", None)
+
+    def append(self, *args):
+        self._invalidate()
+        return super().append(*args)
+
+    def extend(self, *args):
+        self._invalidate()
+        return super().extend(*args)
+
+    def insert(self, *args):
+        self._invalidate()
+        return super().insert(*args)
+
+    def remove(self, *args):
+        self._invalidate()
+        return super().remove(*args)
+
+    def pop(self, *args):
+        self._invalidate()
+        return super().pop(*args)
+
+    def clear(self):
+        self._invalidate()
+        return super().clear()
+
+    def sort(self, *args, **kwargs):
+        self._invalidate()
+        return super().sort(*args, **kwargs)
+
+    def reverse(self):
+        self._invalidate()
+        return super().reverse()
+
+    def __setitem__(self, *args):
+        self._invalidate()
+        return super().__setitem__(*args)
+
+    def __delitem__(self, *args):
+        self._invalidate()
+        return super().__delitem__(*args)
+
+    def __iadd__(self, *args):
+        self._invalidate()
+        return super().__iadd__(*args)
+
+    def __imul__(self, *args):
+        self._invalidate()
+        return super().__imul__(*args)
+
+    def _index(self, name):
+        key = ("index", name)
+        memo = self._memo
+        if key not in memo:
+            index = {}
+            for n in self:
+                for k in NOTE_INDEXES[name](n):
+                    index.setdefault(k, []).append(n)
+            memo[key] = {k: tuple(v) for k, v in index.items()}
+        return memo[key]
+
+    def bySubject(self, subject):
+        return NoteList(self._index("subject").get(subject, ()))
+
+    def byPeriod(self, period):
+        return NoteList(self._index("period").get(period, ()))
+
+    def byTeacher(self, teacher):
+        return NoteList(self._index("teacher").get(teacher, ()))
+
+    def filter(self, subject=None, period=None, teacher=None, predicate=None):
+        candidates = [self._index(name).get(value, ()) for name, value in
+                      (("subject", subject), ("period", period), ("teacher", teacher)) if value is not None]
+        if not candidates:
+            candidates = [self]
 
+        smallest = min(candidates, key=len)
+        others = [set(map(id, c)) for c in candidates if c is not smallest]
+
+        return NoteList(n for n in smallest
+                        if all(id(n) in o for o in others) and (predicate is None or predicate(n)))
+
+    def groupBy(self, name):
+        return {k: NoteList(v) for k, v in self._index(name).items()}
+
+    def top(self, k: int = 1, **filters):
+        return nlargest(k, (n for n in (self.filter(**filters) if filters else self) if n.note is not None),
+                        key=lambda n: n.note)
+
+    def bottom(self, k: int = 1, **filters):
+        return nsmallest(k, (n for n in (self.filter(**filters) if filters else self) if n.note is not None),
+                         key=lambda n: n.note)
+
+    def stats(self):
+        memo = self._memo
+        if "stats" not in memo:
+            memo["stats"] = {s: SubjectStats(s, notes) for s, notes in self._index("subject").items()}
+        return dict(memo["stats"])
+
+    def getBests(self):
+        best = None
         bests = []
         for n in self:
             if n.note is None:
                 continue
-            if n.note >= best:
+            if best is None or n.note > best:
+                best = n.note
+                bests = [n]
+            elif n.note == best:
                 bests.append(n)
 
         return bests
 
     def getWorsts(self):
-        worst = 21
-        for n in self:
-            if n.note is None:
-                continue
-            if n.note < worst:
-                worst = n.note
-
+        worst = None
         worsts = []
         for n in self:
             if n.note is None:
                 continue
-            if n.note <= worst:
+            if worst is None or n.note < worst:
+                worst = n.note
+                worsts = [n]
+            elif n.note == worst:
                 worsts.append(n)
 
         return worsts
@@ -92,7 +249,10 @@ class NoteList(list):
 
 
 class Note:
-    def __init__(self, data, period):
+    __slots__ = ("note", "moyenneClass", "moyenneClassMin", "moyenneClassMax", "coef", "subject", "period", "professors",
+                 "_teachers", "_people")
+
+    def __init__(self, data, period, people=None):
         self.note = _toFloat(data["moyenne"])
         self.moyenneClass = _toFloat(data["moyenneClasse"])
         self.moyenneClassMin = _toFloat(data["moyenneMin"])
@@ -100,15 +260,19 @@ class Note:
         self.coef = data["coef"]
         self.subject = data["discipline"]
         self.period = period
-        self.teachers = []
-        for t in data["professeurs"]:
-            t = t["nom"]
-            if t == self.period.headTeacher.fullname:
-                if not self.period.headTeacher.subject:
-                    self.period.headTeacher.subject = self.subject
-                self.teachers.append(Teacher(t, self.subject, True))
-            else:
-                self.teachers.append(Teacher(t, self.subject))
+        self.professors = [t["nom"] for t in data["professeurs"]]
+        self._teachers = None
+        self._people = people
+        if not self.period.headTeacher.subject and self.period.headTeacher.fullname in self.professors:
+            self.period.headTeacher.subject = self.subject
+
+    @property
+    def teachers(self):
+        if self._teachers is None:
+            head = self.period.headTeacher.fullname
+            teacher = self._people.teacher if self._people is not None else Teacher
+            self._teachers = [teacher(t, self.subject, t == head) for t in self.professors]
+        return self._teachers
 
     def __repr__(self):
         return f"<Note: {self.note}; Moyenne de la classe: {self.moyenneClass}; coef: {self.coef}; matière: {self.subject}; profs: " + ", ".join(
@@ -135,6 +299,8 @@ class Period:
 
 
 class Person:
+    __slots__ = ("id", "name", "surname", "sex", "role")
+
     def __init__(self, name, surname, civility, id, role):
         self.id = id
         self.name = name
@@ -148,57 +314,113 @@ class Person:
         return Teacher(("M." if self.sex else "Mme") + " " + self.name + " " + self.surname[0].upper() + ".")
 
 
+class IdentityMap:
+    def __init__(self):
+        self._teachers = {}
+        self._people = {}
+
+    def teacher(self, name, subject=None, isHeadTeacher=False):
+        key = (name, subject, isHeadTeacher)
+        t = self._teachers.get(key)
+        if t is None:
+            t = self._teachers.setdefault(key, Teacher(name, subject, isHeadTeacher))
+        return t
+
+    def person(self, data):
+        key = (data["id"], data["role"], data["nom"], data["prenom"], data["civilite"])
+        p = self._people.get(key)
+        if p is None:
+            p = self._people.setdefault(key, Person(data["nom"], data["prenom"], data["civilite"], data["id"],
+                                                    data["role"]))
+        return p
+
+    def __len__(self):
+        return len(self._teachers) + len(self._people)
+
+
 class Attachment:
+    __slots__ = ("session", "id", "name", "date")
+
+    fileType = "PIECE_JOINTE"
+
     def __init__(self, session, data):
         self.session = session
         self.id = data["id"]
         self.name = data["libelle"]
         self.date = data["date"]
 
-    def download(self, filename: str = None):
+    @property
+    def version(self):
+        return self.date
+
+    @property
+    def filename(self):
+        return self.name
+
+    def download(self, filename: str = None, **kwargs):
         if not filename and not exists("downloads"):
             mkdir("downloads")
 
-        return self.session.download("PIECE_JOINTE", self.id, filename or ("downloads/" + self.name))
+        return self.session.download(self.fileType, self.id, filename or ("downloads/" + self.filename),
+                                     version=self.version, **kwargs)
+
+
+def _unarchivedFolder(data):
+    return "sent" if data["mtype"] == "send" else "received"
 
 
 class Message:
-    def __init__(self, session, folder, data):
+    __slots__ = ("session", "id", "read", "subject", "date", "sent", "to", "from_", "folder", "attachements",
+                 "messageList")
+
+    def __init__(self, session, folder, data, messageList=None):
         self.session = session
         self.id = data["id"]
         self.read = data["read"]
         self.subject = data["subject"]
         self.date = data["date"]
         self.sent = data["mtype"] == "send"
-        self.to = [Person(d["nom"], d["prenom"], d["civilite"], d["id"], d["role"]) for d in data["to"]]
-        self.from_ = Person(data["from"]["nom"], data["from"]["prenom"], data["from"]["civilite"], data["from"]["id"],
-                            data["from"]["role"])
+        self.to = [session.people.person(d) for d in data["to"]]
+        self.from_ = session.people.person(data["from"])
         self.folder = folder
         self.attachements = [Attachment(self.session, f) for f in data["files"]]
+        self.messageList = messageList
 
-    def _action(self, name, **kwargs):
-        r = post('https://api.ecoledirecte.com/v3/eleves/' + str(self.session.id) + '/messages.awp?verbe=put',
-                 'data=' + dumps({"token": self.session.token, "ids": [self.id], "action": name, **kwargs},
-                                 ensure_ascii=False)).text
+    def _action(self, name, read=None, folder=None, **kwargs):
+        if self.messageList is not None:
+            return self.messageList._bulk([self], name, 1, read, folder, **kwargs)
 
-        r = loads(r)
+        if iscoroutinefunction(self.session._messageAction):
+            return self._actionAsync(name, read, folder, **kwargs)
 
-        return r
+        self.session._messageAction([self.id], name, **kwargs)
+        self._applied(read, folder)
+
+    async def _actionAsync(self, name, read, folder, **kwargs):
+        await self.session._messageAction([self.id], name, **kwargs)
+        self._applied(read, folder)
+
+    def _applied(self, read, folder):
+        self.session.invalidate("messages")
+        if read is not None:
+            self.read = read
+        if folder is not None:
+            self.folder = folder
 
     def markAsUnread(self):
-        self._action("marquerCommeNonLu")
+        return self._action("marquerCommeNonLu", read=False)
 
     def markAsRead(self):
-        self._action("marquerCommeLu")
+        return self._action("marquerCommeLu", read=True)
 
     def archive(self):
-        self._action("archiver")
+        return self._action("archiver", folder="archived")
 
     def unarchive(self):  # ==============================[ Ne marche pas (jsp pk) ]==============================
-        self._action("desarchiver")
+        return self._action("desarchiver", folder="sent" if self.sent else "received")
 
     def moveTo(self, folderId):
-        self._action("deplacer", idClasseur=folderId)
+        return self._action("deplacer", folder=folderId, idClasseur=folderId)
 
     def __repr__(self):
         return f"<{self.__module__}.{self.__class__.__name__} '{self.subject}'>"
@@ -212,178 +434,365 @@ def _fusion(data):
     return r
 
 
+class MessageView:
+    def __init__(self, messageList, items):
+        self.messageList = messageList
+        self.items = items
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return MessageView(self.messageList, self.items[item])
+        return self.messageList._message(*self.items[item])
+
+    def __iter__(self):
+        for folder, data in self.items:
+            yield self.messageList._message(folder, data)
+
+    def __repr__(self):
+        return f"<{self.__module__}.{self.__class__.__name__} {len(self)} messages>"
+
+
 class MessageList:
     def __init__(self, session, data):
         self.session = session
-        self.folders = {}
-        for folder, messages in data.items():
-            self.folders[folder] = []
-            for m in messages:
-                self.folders[folder].append(Message(self.session, folder, m))
-
-        self._messages: List[Message] = _fusion(self.folders)
+        self.data = data
+        self._built = {}
+        self._index()
+
+    def _index(self):
+        self.folders = {folder: MessageView(self, [(folder, m) for m in messages])
+                        for folder, messages in self.data.items()}
+
+        self._messages = MessageView(self, _fusion({f: v.items for f, v in self.folders.items()}))
+
+    def _message(self, folder, data):
+        key = (folder, data["id"])
+        if key not in self._built:
+            self._built[key] = Message(self.session, folder, data, self)
+        return self._built[key]
+
+    def _select(self, messages):
+        if messages is None:
+            return list(self._messages.items)
+        if isinstance(messages, MessageView):
+            return list(messages.items)
+        ids = {m.id for m in messages}
+        return [(f, m) for f, m in self._messages.items if m["id"] in ids]
+
+    def _apply(self, items, read=None, folder=None):
+        moved = {}
+        for f, m in items:
+            message = self._built.get((f, m["id"]))
+            if read is not None:
+                m["read"] = read
+                if message is not None:
+                    message.read = read
+            target = folder(m) if callable(folder) else folder
+            if target is not None and target != f:
+                moved.setdefault(f, set()).add(m["id"])
+                self.data.setdefault(target, []).append(m)
+                if message is not None:
+                    message.folder = target
+                    self._built[(target, m["id"])] = self._built.pop((f, m["id"]))
+
+        if moved:
+            for f, ids in moved.items():
+                self.data[f] = [m for m in self.data[f] if m["id"] not in ids]
+            self._index()
+
+    def _bulk(self, messages, action, batchSize, read=None, folder=None, **kwargs):
+        items = self._select(messages)
+        batches = [items[i:i + batchSize] for i in range(0, len(items), batchSize)]
+        if iscoroutinefunction(self.session._messageAction):
+            return self._bulkAsync(len(items), batches, action, read, folder, **kwargs)
+
+        done = 0
+        try:
+            for batch in batches:
+                self.session._messageAction([m["id"] for _, m in batch], action, **kwargs)
+                self._apply(batch, read, folder)
+                done += len(batch)
+        finally:
+            if done:
+                self.session.invalidate("messages")
+
+        return len(items)
+
+    async def _bulkAsync(self, count, batches, action, read, folder, **kwargs):
+        done = 0
+        try:
+            for batch in batches:
+                await self.session._messageAction([m["id"] for _, m in batch], action, **kwargs)
+                self._apply(batch, read, folder)
+                done += len(batch)
+        finally:
+            if done:
+                self.session.invalidate("messages")
+
+        return count
+
+    def markAsRead(self, messages=None, batchSize: int = MESSAGE_BATCH_SIZE):
+        return self._bulk(messages, "marquerCommeLu", batchSize, read=True)
+
+    def markAsUnread(self, messages=None, batchSize: int = MESSAGE_BATCH_SIZE):
+        return self._bulk(messages, "marquerCommeNonLu", batchSize, read=False)
+
+    def archive(self, messages=None, batchSize: int = MESSAGE_BATCH_SIZE):
+        return self._bulk(messages, "archiver", batchSize, folder="archived")
+
+    def unarchive(self, messages=None, batchSize: int = MESSAGE_BATCH_SIZE):
+        return self._bulk(messages, "desarchiver", batchSize, folder=_unarchivedFolder)
+
+    def moveTo(self, messages, folderId, batchSize: int = MESSAGE_BATCH_SIZE):
+        return self._bulk(messages, "deplacer", batchSize, folder=folderId, idClasseur=folderId)
 
     def getUnread(self):
-        return [m for m in self._messages if not m.read]
+        return MessageView(self, [(f, m) for f, m in self._messages.items if not m["read"]])
 
     def getRead(self):
-        return [m for m in self._messages if m.read]
+        return MessageView(self, [(f, m) for f, m in self._messages.items if m["read"]])
 
-    def __iter__(self):
-        self.n = 0
-        return self
+    def __len__(self):
+        return len(self._messages)
 
-    def __next__(self):
-        if self.n < len(self._messages):
-            self.n += 1
-            return self._messages[self.n - 1]
-        else:
-            del self.n
-            raise StopIteration
+    def __iter__(self):
+        return iter(self._messages)
 
     def __getitem__(self, item):
         return self._messages[item]
 
 
-def loadClassCloudElement(session, parent, data):
+def _normalize(name):
+    return name.lower().strip()
+
+
+def _childKey(parent, name):
+    return (parent.key + "/" if parent.key else "") + _normalize(name)
+
+
+def _attached(node):
+    while node.parent is not None:
+        if node.parent._names.get(_normalize(node.name)) is not node:
+            return False
+        node = node.parent
+    return True
+
+
+def _crawl(root, reload, workers, maxDepth, progress):
+    level = [root]
+    depth = 0
+    loaded = 0
+
+    with ThreadPoolExecutor(workers) as executor:
+        while level:
+            for folder in executor.map(lambda f: f.reload(), level if reload else [f for f in level if not f.isLoaded]):
+                loaded += 1
+                if progress:
+                    progress(loaded, depth, folder)
+
+            if maxDepth is not None and depth >= maxDepth:
+                break
+
+            level = [c for f in level for c in f.children if c.folder]
+            depth += 1
+
+    return root
+
+
+def loadCloudElement(folderClass, session, parent, data):
     if data["type"] == "folder":
-        return ClassCloudFolder(session, parent, data)
+        return folderClass(session, parent, data)
     if data["type"] == "file":
-        return ClassCloudFile(session, parent, data)
+        return folderClass.fileClass(session, parent, data)
+
 
+class CloudFile:
+    fileType = "CLOUD"
 
-class ClassCloudFile:
     def __init__(self, session, parent, data):
         self.session = session
         self.name = data["libelle"]
         self.size = data["taille"]
         self.id = data["id"]
         self.parent = parent
+        self.root = parent.root
+        self.key = _childKey(parent, self.name)
         self.folder = False
+        self._path = None
+
+    @property
+    def version(self):
+        return self.size
+
+    @property
+    def filename(self):
+        return self.name
 
-    def download(self, filename: str = None):
+    def download(self, filename: str = None, **kwargs):
         if not filename and not exists("downloads"):
             mkdir("downloads")
 
-        return self.session.download("CLOUD", self.id, filename or ("downloads/" + self.name))
+        return self.session.download(self.fileType, self.id, filename or ("downloads/" + self.filename),
+                                     version=self.version, **kwargs)
 
     def getPath(self):
-        return self.parent.getPath() + "\\" + self.name
+        if self._path is None:
+            self._path = self.parent.getPath() + "\\" + self.name
+        return self._path
 
     def __repr__(self):
         return f"<{self.__module__}.{self.__class__.__name__} '{self.getPath()}'>"
 
 
-class ClassCloudFolder:
+class CloudFolder:
+    fileType = "CLOUD"
+    fileClass = CloudFile
+
     def __init__(self, session, parent, data):
         self.session = session
         self.name = data["libelle"]
         self.size = data["taille"]
         self.id = data["id"]
-        self.isLoaded = data["isLoaded"]
-        self.children = [loadClassCloudElement(self.session, self, c) for c in data["children"]]
         self.parent = parent
+        self.root = parent.root if parent else self
+        self.key = _childKey(parent, self.name) if parent else ""
         self.folder = True
+        self._path = None
+        if parent is None:
+            self.pathIndex = {}
+        self._setData(data)
+
+    @property
+    def version(self):
+        return self.size
 
-    def download(self, filename: str = None):
+    @property
+    def filename(self):
+        return self.name + ".zip"
+
+    @property
+    def folderClass(self):
+        return type(self)
+
+    def download(self, filename: str = None, **kwargs):
         if not filename and not exists("downloads"):
             mkdir("downloads")
 
-        return self.session.download("CLOUD", self.id, filename or ("downloads/" + self.name + ".zip"))
-
-    def load(self):
-        if self.isLoaded:
-            return
-        r = post('https://api.ecoledirecte.com/v3/cloud/W/' + str(self.getId()) + '.awp?' + urlencode(
-            dict(verbe="get", idFolder=self.getPath())),
-                 'data={"token": "' + self.session.token + '"}').content.decode("utf8")
+        return self.session.download(self.fileType, self.id, filename or ("downloads/" + self.filename),
+                                     version=self.version, **kwargs)
 
-        data = loads(r)["data"][0]
+    def _loadUrl(self):
+        return API_URL + self.root.cloudUrl() + '.awp?' + urlencode(dict(verbe="get", idFolder=self.getPath()))
 
-        self.children = [loadClassCloudElement(self.session, self, c) for c in data["children"]]
+    def _setData(self, data):
+        self.children = [loadCloudElement(self.folderClass, self.session, self, c) for c in data["children"]]
         self.isLoaded = data["isLoaded"]
+        self._names = {}
+        for c in reversed(self.children):
+            self._names[_normalize(c.name)] = c
+        for c in self.children:
+            self.root.pathIndex[c.key] = c
 
-        return self
+    def load(self):
+        if self.isLoaded:
+            return
+        return self.reload()
 
     def reload(self):
-        r = post('https://api.ecoledirecte.com/v3/cloud/W/' + str(self.getId()) + '.awp?' + urlencode(
-            dict(verbe="get", idFolder=self.getPath())),
-                 'data={"token": "' + self.session.token + '"}').content.decode("utf8")
-
-        data = loads(r)["data"][0]
-
-        self.children = [loadClassCloudElement(self.session, self, c) for c in data["children"]]
-        self.isLoaded = data["isLoaded"]
+        if iscoroutinefunction(self.session._request):
+            raise EcoleDirecteError(f"Folder '{self.getPath()}' must be loaded with 'await session.loadFolder(folder)' "
+                                    f"or 'await session.loadAll(folder)' on an AsyncSession")
+        self._setData(self.session._request(self._loadUrl())[0])
 
         return self
 
-    def loadAll(self):
-        self.load()
-        for c in self.children:
-            if c.folder:
-                c.loadAll()
+    def loadAll(self, workers: int = CRAWL_WORKERS, maxDepth: int = None, progress=None):
+        return _crawl(self, False, workers, maxDepth, progress)
 
-    def reloadAll(self):
-        self.reload()
-        for c in self.children:
-            if c.folder:
-                c.reloadAll()
+    def reloadAll(self, workers: int = CRAWL_WORKERS, maxDepth: int = None, progress=None):
+        return _crawl(self, True, workers, maxDepth, progress)
 
     def getChildByName(self, name: str):
         self.load()
-        for c in self.children:
-            if c.name.lower().strip() == name.lower().strip():
-                return c
-
-        return None
+        return self._names.get(_normalize(name))
 
     def getFileByPath(self, path: str):
-        self.load()
-
-        path = path.replace("\\", "/")
+        parts = [_normalize(p) for p in path.replace("\\", "/").split("/") if p.strip()]
+        if not parts:
+            return
 
-        f, *p = path.split("/")
+        node = self.root.pathIndex.get("/".join([self.key] + parts if self.key else parts))
+        if node is not None and _attached(node):
+            return node
 
-        p = "/".join(p)
+        f = self.getChildByName(parts[0])
 
-        f = self.getChildByName(f)
+        if not f or len(parts) == 1:
+            return f
 
-        if not f:
+        if not f.folder:
             return
 
-        if not p:
-            return f
-
-        return f.getFileByPath(p)
+        return f.getFileByPath("/".join(parts[1:]))
 
     def tree(self):
-        self.load()
+        self.loadAll()
+        return self._tree()
+
+    def _tree(self):
         r = {}
         for c in self.children:
             if c.folder:
-                r[c.name] = c.tree()
+                r[c.name] = c._tree()
             else:
                 r[c.name] = c
         return r
 
     def getPath(self):
-        return self.parent.getPath() + "\\" + self.name
+        if self._path is None:
+            self._path = self.parent.getPath() + "\\" + self.name
+        return self._path
 
     def getId(self):
-        return self.parent.getId()
+        return self.root.getId()
 
     def __repr__(self):
         return f"<{self.__module__}.{self.__class__.__name__} '{self.getPath()}'>"
 
 
-class ClassCloud(ClassCloudFolder):
-    def __init__(self, session, id, data):
-        super().__init__(session, None, data[0])
-        self.cloudId = id
+class CloudRoot:
+    def mirror(self, directory: str, delete: bool = False, workers: int = CRAWL_WORKERS, retries: int = 2):
+        return mirror(self, directory, delete, workers, retries)
 
     def getPath(self):
         return ""
 
+
+def loadClassCloudElement(session, parent, data):
+    return loadCloudElement(ClassCloudFolder, session, parent, data)
+
+
+class ClassCloudFile(CloudFile):
+    pass
+
+
+class ClassCloudFolder(CloudFolder):
+    fileClass = ClassCloudFile
+
+
+class ClassCloud(CloudRoot, ClassCloudFolder):
+    folderClass = ClassCloudFolder
+
+    def __init__(self, session, id, data):
+        self.cloudId = id
+        super().__init__(session, None, data[0])
+
+    def cloudUrl(self):
+        return 'cloud/W/' + str(self.cloudId)
+
     def getId(self):
         return self.cloudId
 
@@ -402,142 +811,31 @@ class MetaClassCloud:
 
 
 def loadPersonalCloudElement(session, parent, data):
-    if data["type"] == "folder":
-        return PersonalCloudFolder(session, parent, data)
-    if data["type"] == "file":
-        return PersonalCloudFile(session, parent, data)
-
-
-class PersonalCloudFile:
-    def __init__(self, session, parent, data):
-        self.session = session
-        self.name = data["libelle"]
-        self.size = data["taille"]
-        self.id = data["id"]
-        self.parent = parent
-        self.folder = False
-
-    def download(self, filename: str = None):
-        if not filename and not exists("downloads"):
-            mkdir("downloads")
-
-        return self.session.download("CLOUD", self.id, filename or ("downloads/" + self.name))
-
-    def getPath(self):
-        return self.parent.getPath() + "\\" + self.name
-
-    def __repr__(self):
-        return f"<{self.__module__}.{self.__class__.__name__} '{self.getPath()}'>"
-
-
-class PersonalCloudFolder:
-    def __init__(self, session, parent, data):
-        self.session = session
-        self.name = data["libelle"]
-        self.size = data["taille"]
-        self.id = data["id"]
-        self.isLoaded = data["isLoaded"]
-        self.children = [loadPersonalCloudElement(self.session, self, c) for c in data["children"]]
-        self.parent = parent
-        self.folder = True
-
-    def download(self, filename: str = None):
-        if not filename and not exists("downloads"):
-            mkdir("downloads")
-
-        return self.session.download("CLOUD", self.id, filename or ("downloads/" + self.name + ".zip"))
-
-    def load(self):
-        if self.isLoaded:
-            return
-        r = post('https://api.ecoledirecte.com/v3/cloud/E/' + str(self.session.id) + '.awp?' + urlencode(
-            dict(verbe="get", idFolder=self.getPath())),
-                 'data={"token": "' + self.session.token + '"}').content.decode("utf8")
-
-        data = loads(r)["data"][0]
-
-        self.children = [loadPersonalCloudElement(self.session, self, c) for c in data["children"]]
-        self.isLoaded = data["isLoaded"]
-
-        return self
-
-    def reload(self):
-        r = post('https://api.ecoledirecte.com/v3/cloud/E/' + str(self.session.id) + '.awp?' + urlencode(
-            dict(verbe="get", idFolder=self.getPath())),
-                 'data={"token": "' + self.session.token + '"}').content.decode("utf8")
-
-        data = loads(r)["data"][0]
-
-        self.children = [loadPersonalCloudElement(self.session, self, c) for c in data["children"]]
-        self.isLoaded = data["isLoaded"]
+    return loadCloudElement(PersonalCloudFolder, session, parent, data)
 
-        return self
-
-    def loadAll(self):
-        self.load()
-        for c in self.children:
-            if c.folder:
-                c.loadAll()
 
-    def reloadAll(self):
-        self.reload()
-        for c in self.children:
-            if c.folder:
-                c.reloadAll()
-
-    def getChildByName(self, name: str):
-        self.load()
-        for c in self.children:
-            if c.name.lower().strip() == name.lower().strip():
-                return c
-
-        return None
-
-    def getFileByPath(self, path: str):
-        self.load()
+class PersonalCloudFile(CloudFile):
+    pass
 
-        path = path.replace("\\", "/")
 
-        f, *p = path.split("/")
+class PersonalCloudFolder(CloudFolder):
+    fileClass = PersonalCloudFile
 
-        p = "/".join(p)
-
-        f = self.getChildByName(f)
-
-        if not f:
-            return
-
-        if not p:
-            return f
-
-        return f.getFileByPath(p)
-
-    def tree(self):
-        self.loadAll()
-        r = {}
-        for c in self.children:
-            if c.folder:
-                r[c.name] = c.tree()
-            else:
-                r[c.name] = c
-        return r
-
-    def getPath(self):
-        return self.parent.getPath() + "\\" + self.name
-
-    def __repr__(self):
-        return f"<{self.__module__}.{self.__class__.__name__} '{self.getPath()}'>"
 
+class PersonalCloud(CloudRoot, PersonalCloudFolder):
+    folderClass = PersonalCloudFolder
 
-class PersonalCloud(PersonalCloudFolder):
     def __init__(self, session, data):
         super().__init__(session, None, data[0])
 
-    def download(self, filename: str = None):
+    def cloudUrl(self):
+        return 'cloud/E/' + str(self.session.id)
+
+    def download(self, filename: str = None, **kwargs):
         raise DownloadError("Can't download all the cloud")
 
-    def getPath(self):
-        return ""
+    def getId(self):
+        return self.session.id
 
 
 class Document:
@@ -548,17 +846,32 @@ class Document:
         self.date = data["date"]
         self.session = session
 
-    def download(self, filename: str = None):
+    @property
+    def fileType(self):
+        return self.type
+
+    @property
+    def version(self):
+        return self.date
+
+    @property
+    def filename(self):
+        return self.name + ".pdf"
+
+    def download(self, filename: str = None, **kwargs):
         if not filename and not exists("downloads"):
             mkdir("downloads")
 
-        return self.session.download(self.type, self.id, filename or ("downloads/" + self.name + ".pdf"))
+        return self.session.download(self.fileType, self.id, filename or ("downloads/" + self.filename),
+                                     version=self.version, **kwargs)
 
     def __repr__(self):
         return f"<{self.__module__}.{self.__class__.__name__} '{self.name}'>"
 
 
 class Retard:
+    __slots__ = ("id", "justified", "motif", "duration", "date", "comment")
+
     def __init__(self, data):
         self.id = data["id"]
         self.justified = data["justifie"]
@@ -569,6 +882,8 @@ class Retard:
 
 
 class Absence:
+    __slots__ = ("id", "justified", "motif", "duration", "date", "comment")
+
     def __init__(self, data):
         self.id = data["id"]
         self.justified = data["justifie"]
@@ -579,6 +894,8 @@ class Absence:
 
 
 class CompteLog:
+    __slots__ = ("date", "money", "name")
+
     def __init__(self, data):
         self.date = data["date"]
         self.money = data["montant"]
@@ -603,12 +920,28 @@ class Compte:
                     self.logs.append(CompteLog(l2))
 
 
-class Session:
-    def __init__(self, username, password):
-        r = post('https://api.ecoledirecte.com/v3/login.awp',
-                 'data={"identifiant": "' + username + '","motdepasse": "' + password + '"}').text
-        r = loads(r)
+ENDPOINTS = {
+    "homeworks": "Eleves/{id}/cahierdetexte.awp?verbe=get",
+    "homeworksForDay": "Eleves/{id}/cahierdetexte/{day}.awp?verbe=get",
+    "notes": "eleves/{id}/notes.awp?verbe=get",
+    "messages": "eleves/{id}/messages.awp?verbe=getall&orderBy=date&order=desc",
+    "personalCloud": "cloud/E/{id}.awp?verbe=get",
+    "clouds": "E/{id}/espacestravail.awp?verbe=get",
+    "cloud": "cloud/W/{cloudId}.awp?verbe=get",
+    "documents": "elevesDocuments.awp?verbe=get",
+    "schoolLife": "eleves/{id}/viescolaire.awp?verbe=get",
+    "moneyData": "comptes/detail.awp?verbe=get",
+}
+
+ACCOUNT_FIELDS = ("token", "id", "name", "surname", "username", "currentSchoolYear", "loginId", "lastConnection", "sex",
+                  "photoURL", "classId", "classCode", "className")
+INVALID_TOKEN_CODES = (520, 525)
+
+
+class BaseSession:
+    homeworkTTL = HOMEWORK_TTL
 
+    def _loadAccount(self, r):
         if r["code"] == 505:
             raise LoginError("Invalid username or password")
 
@@ -632,32 +965,76 @@ class Session:
         self.classCode = profile["classe"]["code"]
         self.className = profile["classe"]["libelle"]
 
-    def _request(self, url, data):
-        r = post(url, data).content.decode("utf8")
-
-        r = loads(r)
-
+    def dump(self):
+        return {f: getattr(self, f) for f in ACCOUNT_FIELDS}
+
+    def addHook(self, after=None, before=None):
+        if before is not None:
+            self.hooks["before"].append(before)
+        if after is not None:
+            self.hooks["after"].append(after)
+
+    @staticmethod
+    def _runHooks(hooks, event):
+        for hook in hooks:
+            try:
+                hook(event)
+            except Exception:
+                logger.exception("Request hook %r failed", hook)
+
+    @contextmanager
+    def _instrument(self, url):
+        event = RequestEvent(url)
+        self._runHooks(self.hooks["before"], event)
+        event.start = perf_counter()
+
+        try:
+            yield event
+        except BaseException as e:
+            event.error = e
+            event.errorCode = getattr(e, "code", None)
+            raise
+        finally:
+            event.latency = perf_counter() - event.start
+            self._runHooks(self.hooks["after"], event)
+
+    def _loadDump(self, state):
+        for f in ACCOUNT_FIELDS:
+            setattr(self, f, state[f])
+
+    @staticmethod
+    def _loginData(username, password):
+        return payload({"identifiant": username, "motdepasse": password})
+
+    def _tokenData(self, data: dict = None):
+        return payload({"token": self.token, **(data or {})})
+
+    def _downloadData(self, type, id):
+        return urlencode({"token": self.token, "leTypeDeFichier": type, "fichierId": id})
+
+    def _url(self, endpoint, **kwargs):
+        return API_URL + ENDPOINTS[endpoint].format(id=self.id, **kwargs)
+
+    @staticmethod
+    def _checkResponse(r):
         if r.get("message"):
-            raise APIError(r["message"])
+            raise APIError(r["message"], r.get("code"))
 
         return r["data"]
 
-    def _download(self, type, id):
-        return post('https://api.ecoledirecte.com/v3/telechargement.awp?verbe=get',
-                    'token=' + self.token + '&leTypeDeFichier=' + type + '&' + 'fichierId=' + str(id)).content
-
-    def download(self, type, id, filename):
-        r = self._download(type, id)
-
-        with open(filename, "wb") as f:
-            f.write(r)
-
-        return filename
-
-    def getHomeworks(self):
-        r = self._request('https://api.ecoledirecte.com/v3/Eleves/' + str(self.id) + '/cahierdetexte.awp?verbe=get',
-                          'data={"token": "' + self.token + '"}')
-
+    @staticmethod
+    def _downloadError(r):
+        if r.status_code >= 400 or "json" not in r.headers.get("Content-Type", ""):
+            return None
+        try:
+            data = decode(r.content)
+        except ValueError:
+            return None
+        if isinstance(data, dict) and data.get("code") not in (None, 200):
+            return data
+
+    @staticmethod
+    def _makeHomeworks(r):
         result = []
         for date, hws in r.items():
             for hw in hws:
@@ -665,75 +1042,267 @@ class Session:
 
         return result
 
-    def getHomeworksForDay(self, day):
-        r = self._request(
-            'https://api.ecoledirecte.com/v3/Eleves/' + str(self.id) + '/cahierdetexte/' + day + '.awp?verbe=get',
-            'data={"token": "' + self.token + '"}')
-
-        result = []
-        for date, hws in r.items():
-            for hw in hws:
-                result.append(Homework(date, hw))
+    @staticmethod
+    def _makeHomeworksForDay(r):
+        return [Homework(r["date"], {"matiere": m["matiere"], **m["aFaire"]}) for m in r["matieres"] if "aFaire" in m]
 
-        return r
+    def _cachedDay(self, day, refresh):
+        entry = None if refresh else self.homeworkDays.get(day)
+        if entry is not None and entry[0] > time():
+            return entry[1]
 
-    def getNotes(self):
-        r = self._request('https://api.ecoledirecte.com/v3/eleves/' + str(self.id) + '/notes.awp?verbe=get',
-                          'data={"token": "' + self.token + '"}')
+    def _storeDay(self, day, r):
+        homeworks = self._makeHomeworksForDay(r)
+        if self.homeworkTTL > 0:
+            self.homeworkDays[day] = (time() + self.homeworkTTL, homeworks)
+        return homeworks
 
+    def _makeNotes(self, r):
         result = []
         for p in r["periodes"]:
             p = Period(p)
             for n in p.data:
-                result.append(Note(n, p))
+                result.append(Note(n, p, self.people))
 
         return NoteList(result)
 
-    def getMessages(self):
-        r = self._request('https://api.ecoledirecte.com/v3/eleves/' + str(
-            self.id) + '/messages.awp?verbe=getall&orderBy=date&order=desc',
-                          'data={"token": "' + self.token + '"}')
-
-        data = r["messages"]
-
-        return MessageList(self, data)
-
-    def getPersonalCloud(self):
-        r = self._request('https://api.ecoledirecte.com/v3/cloud/E/' + str(self.id) + '.awp?verbe=get',
-                          'data={"token": "' + self.token + '"}')
+    def _makeMessages(self, r):
+        return MessageList(self, r["messages"])
 
+    def _makePersonalCloud(self, r):
         return PersonalCloud(self, r)
 
-    def getClouds(self):
-        r = self._request('https://api.ecoledirecte.com/v3/E/' + str(self.id) + '/espacestravail.awp?verbe=get',
-                          'data={"token": "' + self.token + '"}')
-
+    def _makeClouds(self, r):
         return [MetaClassCloud(self, c) for c in r if c["cloud"]]
 
-    def getCloud(self, id: int):
-        r = self._request('https://api.ecoledirecte.com/v3/cloud/W/' + str(id) + '.awp?verbe=get',
-                          'data={"token": "' + self.token + '"}')
-
+    def _makeCloud(self, id, r):
         return ClassCloud(self, id, r)
 
-    def getDocuments(self):
-        r = self._request('https://api.ecoledirecte.com/v3/elevesDocuments.awp?verbe=get',
-                          'data={"token": "' + self.token + '"}')
-
+    def _makeDocuments(self, r):
         return {
             "administrative": [Document(self, d) for d in r["administratifs"]],
             "schoolLife": [Document(self, d) for d in r["viescolaire"]],
             "notes": [Document(self, d) for d in r["notes"]]
         }
 
-    def getSchoolLife(self):
-        r = self._request('https://api.ecoledirecte.com/v3/eleves/' + str(self.id) + '/viescolaire.awp?verbe=get',
-                          'data={"token": "' + self.token + '"}')
-
+    @staticmethod
+    def _makeSchoolLife(r):
         return [Absence(data) if data["typeElement"] else Retard(data) for data in r["absencesRetards"]]
 
-    def getMoneyData(self):
-        r = self._request('https://api.ecoledirecte.com/v3/comptes/detail.awp?verbe=get',
-                          'data={"token": "' + self.token + '"}')
-
+    @staticmethod
+    def _makeMoneyData(r):
         return [Compte(c) for c in r["comptes"]]
+
+
+class Session(BaseSession):
+    def __init__(self, username=None, password=None, transport: Transport = None, downloadCache: DownloadCache = None,
+                 responseCache: ResponseCache = None, tokenStore: TokenStore = None, state: dict = None):
+        self._ownTransport = transport is None
+        self.transport = transport or Transport()
+        self.downloadCache = downloadCache
+        self.responseCache = responseCache
+        if responseCache is not None:
+            self.homeworkTTL = responseCache.ttls.get("homeworksForDay", responseCache.ttl)
+        self.tokenStore = tokenStore
+        self.people = IdentityMap()
+        self.hooks = {"before": [], "after": []}
+        self.homeworkDays = {}
+        self._credentials = (username, password)
+        self._loginLock = Lock()
+
+        if state is None and tokenStore is not None and username is not None:
+            state = tokenStore.get(username, password)
+
+        if state is not None:
+            self._loadDump(state)
+        elif username is not None:
+            self.login()
+        else:
+            raise LoginError("A username and password or a saved session state is needed")
+
+    @classmethod
+    def restore(cls, state: dict, username=None, password=None, **kwargs):
+        return cls(username, password, state=state, **kwargs)
+
+    def login(self):
+        username, password = self._credentials
+        if username is None:
+            raise LoginError("Can't log in again without a username and password")
+
+        with self._instrument(API_URL + 'login.awp') as event:
+            self._loadAccount(self._send(event, API_URL + 'login.awp', self._loginData(username, password)))
+
+        if self.tokenStore is not None:
+            self.tokenStore.set(username, password, self.dump())
+
+    def _relogin(self, token):
+        with self._loginLock:
+            if self.token == token:
+                self.login()
+
+    def _post(self, url, data, **kwargs):
+        return self.transport.post(url, data, **kwargs)
+
+    def close(self):
+        if self._ownTransport:
+            self.transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _send(self, event, url, data):
+        r = self._post(url, data)
+        event.status = r.status_code
+        event.size += len(r.content)
+        return decode(r.content)
+
+    def _request(self, url, data: dict = None):
+        with self._instrument(url) as event:
+            token = self.token
+            r = self._send(event, url, self._tokenData(data))
+
+            if r.get("code") in INVALID_TOKEN_CODES and self._credentials[0] is not None:
+                self._relogin(token)
+                r = self._send(event, url, self._tokenData(data))
+
+            return self._checkResponse(r)
+
+    def _messageAction(self, ids, action, **kwargs):
+        return self._request(API_URL + 'eleves/' + str(self.id) + '/messages.awp?verbe=put',
+                             {"ids": list(ids), "action": action, **kwargs})
+
+    def _get(self, endpoint, refresh: bool = False, **kwargs):
+        url = self._url(endpoint, **kwargs)
+
+        if self.responseCache is None:
+            return self._request(url)
+
+        key = f"{self.id}:{endpoint}:{url}"
+        r = None if refresh else self.responseCache.get(key, endpoint)
+        if r is None:
+            r = self._request(url)
+            self.responseCache.set(key, endpoint, r)
+
+        return r
+
+    def invalidate(self, endpoint: str = None):
+        if endpoint in (None, "homeworksForDay"):
+            self.homeworkDays.clear()
+        if self.responseCache is not None:
+            self.responseCache.invalidate(f"{self.id}:" + (endpoint + ":" if endpoint else ""))
+
+    def _openDownload(self, type, id, offset):
+        url = API_URL + 'telechargement.awp?verbe=get'
+        headers = {"Range": f"bytes={offset}-"} if offset else None
+        token = self.token
+        r = self._post(url, self._downloadData(type, id), headers=headers, stream=True)
+
+        error = self._downloadError(r)
+        if error is not None and error["code"] in INVALID_TOKEN_CODES and self._credentials[0] is not None:
+            r.close()
+            self._relogin(token)
+            r = self._post(url, self._downloadData(type, id), headers=headers, stream=True)
+            error = self._downloadError(r)
+
+        if error is not None:
+            r.close()
+            raise DownloadError(f"Can't download {type} {id}: {error.get('message') or error['code']}")
+
+        return r
+
+    def download(self, type, id, filename, chunkSize: int = DOWNLOAD_CHUNK_SIZE, resume: bool = False, progress=None,
+                 version=None):
+        if self.downloadCache and self.downloadCache.get(type, id, version, filename):
+            return filename
+
+        part = filename + ".part"
+        offset = getsize(part) if resume and exists(part) else 0
+        stale = False
+
+        try:
+            with self._instrument(API_URL + 'telechargement.awp?verbe=get') as event, \
+                    self._openDownload(type, id, offset) as r:
+                event.status = r.status_code
+                if offset and r.status_code == 416:
+                    stale = _completeLength(r) != offset
+                    chunks = ()
+                    total = offset
+                elif r.status_code >= 400:
+                    raise DownloadError(f"Can't download {type} {id} (HTTP {r.status_code})")
+                else:
+                    chunks = r.iter_content(chunkSize)
+                    if offset and r.status_code != 206:
+                        offset = 0
+                    total = int(r.headers["Content-Length"]) + offset if "Content-Length" in r.headers else None
+
+                done = offset
+
+                with open(part, "ab" if offset else "wb") as f:
+                    for chunk in chunks:
+                        f.write(chunk)
+                        done += len(chunk)
+                        event.size += len(chunk)
+                        if progress:
+                            progress(done, total)
+        except BaseException:
+            if not resume and exists(part):
+                remove(part)
+            raise
+
+        if stale:
+            remove(part)
+            return self.download(type, id, filename, chunkSize, resume, progress, version)
+
+        replace(part, filename)
+
+        if self.downloadCache:
+            self.downloadCache.put(type, id, version, filename)
+
+        return filename
+
+    def getHomeworks(self, refresh: bool = False):
+        return self._makeHomeworks(self._get("homeworks", refresh))
+
+    def getHomeworksForDay(self, day, refresh: bool = False):
+        day = isoDay(day)
+        homeworks = self._cachedDay(day, refresh)
+        if homeworks is None:
+            homeworks = self._storeDay(day, self._get("homeworksForDay", refresh, day=day))
+        return homeworks
+
+    def getHomeworksRange(self, start, end, workers: int = HOMEWORK_WORKERS, refresh: bool = False):
+        result = {d: self._cachedDay(d, refresh) for d in dayRange(start, end)}
+        missing = [d for d, homeworks in result.items() if homeworks is None]
+
+        with ThreadPoolExecutor(workers) as executor:
+            for d, r in zip(missing, executor.map(lambda d: self._get("homeworksForDay", refresh, day=d), missing)):
+                result[d] = self._storeDay(d, r)
+
+        return result
+
+    def getNotes(self, refresh: bool = False):
+        return self._makeNotes(self._get("notes", refresh))
+
+    def getMessages(self, refresh: bool = False):
+        return self._makeMessages(self._get("messages", refresh))
+
+    def getPersonalCloud(self, refresh: bool = False):
+        return self._makePersonalCloud(self._get("personalCloud", refresh))
+
+    def getClouds(self, refresh: bool = False):
+        return self._makeClouds(self._get("clouds", refresh))
+
+    def getCloud(self, id: int, refresh: bool = False):
+        return self._makeCloud(id, self._get("cloud", refresh, cloudId=id))
+
+    def getDocuments(self, refresh: bool = False):
+        return self._makeDocuments(self._get("documents", refresh))
+
+    def getSchoolLife(self, refresh: bool = False):
+        return self._makeSchoolLife(self._get("schoolLife", refresh))
+
+    def getMoneyData(self, refresh: bool = False):
+        return self._makeMoneyData(self._get("moneyData", refresh))
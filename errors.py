@@ -3,7 +3,9 @@ class EcoleDirecteError(Exception):
 
 
 class APIError(EcoleDirecteError):
-    pass
+    def __init__(self, message, code=None):
+        super().__init__(message)
+        self.code = code
 
 
 class DownloadError(EcoleDirecteError):
@@ -0,0 +1,291 @@
+from argparse import ArgumentParser
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from json import loads, dumps
+from re import match
+from threading import Thread
+from urllib.parse import urlparse, parse_qs
+
+SUBJECTS = ("FRANCAIS", "MATHEMATIQUES", "HISTOIRE-GEOGRAPHIE", "ANGLAIS LV1", "ESPAGNOL LV2", "PHYSIQUE-CHIMIE",
+            "SCIENCES VIE & TERRE", "TECHNOLOGIE", "ARTS PLASTIQUES", "EDUCATION MUSICALE", "ED.PHYSIQUE & SPORT.")
+FOLDERS = ("received", "sent", "archived", "draft")
+
+
+def _grade(i):
+    return f"{(i * 7) % 20},{(i * 3) % 10}"
+
+
+def _person(i, role="P"):
+    return {"nom": f"NOM{i % 50}", "prenom": f"Prenom{i % 50}", "civilite": "M." if i % 2 else "Mme", "id": i % 50,
+            "role": role}
+
+
+class SyntheticAccount:
+    def __init__(self, id: int = 1, messages: int = 100, subjects: int = 10, periods: int = 3, folders: int = 20,
+                 filesPerFolder: int = 5, branching: int = 4, homeworkDays: int = 10, absences: int = 10,
+                 comptes: int = 2, ecritures: int = 20, fileSize: int = 10 * 1024):
+        self.id = id
+        self.messages = messages
+        self.subjects = subjects
+        self.periods = periods
+        self.folders = folders
+        self.filesPerFolder = filesPerFolder
+        self.branching = branching
+        self.homeworkDays = homeworkDays
+        self.absences = absences
+        self.comptes = comptes
+        self.ecritures = ecritures
+        self.fileSize = fileSize
+        self.messageState = {}
+
+    @property
+    def token(self):
+        return f"token-{self.id}"
+
+    def login(self, username):
+        return {"code": 200, "token": self.token, "message": "", "data": {"accounts": [{
+            "id": self.id, "nom": "ELEVE", "prenom": f"Eleve{self.id}", "identifiant": username,
+            "anneeScolaireCourante": "2021-2022", "idLogin": self.id, "lastConnexion": "2021-09-01 08:00",
+            "profile": {"sexe": "M" if self.id % 2 else "F", "photo": "", "classe": {"id": 1, "code": "3A",
+                                                                                      "libelle": "3eme A"}}
+        }]}}
+
+    def notes(self):
+        head = "M. NOM0 P."
+        periods = []
+        for p in range(self.periods):
+            disciplines = [{
+                "discipline": SUBJECTS[s % len(SUBJECTS)] + (f" {s // len(SUBJECTS)}" if s >= len(SUBJECTS) else ""),
+                "moyenne": _grade(p * 31 + s), "moyenneClasse": _grade(p + s + 1), "moyenneMin": "4,5",
+                "moyenneMax": "19", "coef": 1 + s % 3,
+                "professeurs": [{"nom": head if s == 0 else f"{'M.' if s % 2 else 'Mme'} NOM{s} P."}]
+            } for s in range(self.subjects)]
+            periods.append({"periode": f"Trimestre {p + 1}", "dateDebut": "2021-09-01", "dateFin": "2021-12-01",
+                            "dateConseil": "2021-12-10", "heureConseil": "17:00", "ensembleMatieres": {
+                                "moyenneGenerale": "13,5", "moyenneClasse": "12", "moyenneMin": "6",
+                                "moyenneMax": "18", "nomPP": head, "appreciationPP": "",
+                                "disciplines": disciplines}})
+        return {"periodes": periods}
+
+    @staticmethod
+    def _messageFolder(i):
+        return FOLDERS[0] if i % 10 < 7 else FOLDERS[1 + i % 3]
+
+    def messageList(self):
+        r = {f: [] for f in FOLDERS}
+        for i in range(self.messages):
+            folder = self._messageFolder(i)
+            state = self.messageState.get(self.messages - i, {})
+            r.setdefault(state.get("folder", folder), []).append({
+                "id": self.messages - i, "read": state.get("read", i % 3 != 0), "subject": f"Message {i}",
+                "date": f"2021-{1 + i % 12:02d}-{1 + i % 28:02d} 08:00:00",
+                "mtype": "send" if folder == "sent" else "received",
+                "to": [_person(self.id, "E")], "from": _person(i),
+                "files": [{"id": i * 10 + j, "libelle": f"piece {i}-{j}.pdf", "date": "2021-01-01"}
+                          for j in range(i % 3)]
+            })
+        return {"messages": r}
+
+    def messageAction(self, ids, action, idClasseur=None, **kwargs):
+        for id in ids:
+            state = self.messageState.setdefault(id, {})
+            if action in ("marquerCommeLu", "marquerCommeNonLu"):
+                state["read"] = action == "marquerCommeLu"
+            elif action == "archiver":
+                state["folder"] = "archived"
+            elif action == "desarchiver":
+                state["folder"] = "sent" if self._messageFolder(self.messages - id) == "sent" else "received"
+            elif action == "deplacer":
+                state["folder"] = idClasseur
+
+    def _folder(self, i, depth):
+        children = []
+        if depth != 0:
+            for c in range(i * self.branching + 1, min(i * self.branching + self.branching, self.folders - 1) + 1):
+                children.append(self._folder(c, None if depth is None else depth - 1))
+            for f in range(self.filesPerFolder):
+                children.append({"type": "file", "libelle": f"fichier {i}-{f}.pdf", "taille": self.fileSize,
+                                 "id": f"{i}-{f}"})
+        return {"type": "folder", "libelle": "" if i == 0 else f"Dossier {i}", "taille": 0, "id": f"{i}",
+                "isLoaded": depth != 0, "children": children}
+
+    def cloud(self, path):
+        name = path.split("\\")[-1]
+        i = int(name[len("Dossier "):]) if name.startswith("Dossier ") else 0
+        if i >= self.folders:
+            return None
+        return [self._folder(i, 1)]
+
+    def cloudTree(self):
+        return [self._folder(0, None)]
+
+    def homeworks(self):
+        return {f"2021-09-{1 + d:02d}": [{"matiere": SUBJECTS[(d + h) % len(SUBJECTS)], "effectue": h % 2 == 0,
+                                          "donneLe": "2021-08-30", "idDevoir": d * 10 + h} for h in range(3)]
+                for d in range(self.homeworkDays)}
+
+    def homeworksForDay(self, day):
+        return {"date": day, "matieres": [{"matiere": SUBJECTS[h], "id": h, "aFaire": {
+            "effectue": h % 2 == 0, "donneLe": "2021-08-30", "contenu": ""}} for h in range(3)]}
+
+    def schoolLife(self):
+        return {"absencesRetards": [{"id": i, "typeElement": "Absence" if i % 2 else "", "justifie": i % 3 == 0,
+                                     "motif": "Maladie", "libelle": "1 demi-journée", "date": "2021-10-01",
+                                     "commentaire": ""} for i in range(self.absences)]}
+
+    def documents(self):
+        def docs(kind, n):
+            return [{"type": "FICHIER_CDT", "id": f"{kind}{i}", "libelle": f"{kind} {i}", "date": "2021-10-01"}
+                    for i in range(n)]
+        return {"administratifs": docs(1, 2), "viescolaire": docs(2, 2), "notes": docs(3, self.periods)}
+
+    def moneyData(self):
+        return {"comptes": [{"id": c, "solde": 12.5 * c, "libelle": f" Compte {c} ", "ecritures": [
+            {"date": "2021-10-01", "montant": -3.5, "libelle": f"Repas {e}"} if e % 4 else
+            {"ecritures": [{"date": "2021-10-02", "montant": 20, "libelle": f"Rechargement {e}"}]}
+            for e in range(self.ecritures)]} for c in range(self.comptes)]}
+
+    def workspaces(self):
+        return [{"id": "1", "titre": "Classe 3A", "cloud": True}, {"id": "2", "titre": "Club", "cloud": False}]
+
+
+def _ok(data):
+    return {"code": 200, "message": "", "data": data}
+
+
+class FakeServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address=("127.0.0.1", 0), accounts: dict = None, **options):
+        super().__init__(address, _Handler)
+        self.accounts = accounts or {}
+        self.options = options
+        self.tokens = {}
+
+    @property
+    def apiUrl(self):
+        return f"http://{self.server_address[0]}:{self.server_address[1]}/v3/"
+
+    def account(self, username):
+        if username not in self.accounts:
+            self.accounts[username] = SyntheticAccount(len(self.accounts) + 1, **self.options)
+        account = self.accounts[username]
+        self.tokens[account.token] = account
+        return account
+
+    def start(self):
+        Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, body, status=200, contentType="application/json", headers=None):
+        if not isinstance(body, bytes):
+            body = dumps(body).encode("utf8")
+        self.send_response(status)
+        self.send_header("Content-Type", contentType)
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        path = url.path[len("/v3/"):] if url.path.startswith("/v3/") else url.path
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode("utf8")
+
+        form = {k: v[0] for k, v in parse_qs(body).items()}
+        if path == "telechargement.awp":
+            return self._download(form)
+
+        data = loads(form["data"]) if "data" in form else {}
+
+        if path == "login.awp":
+            return self._send(self.server.account(data.get("identifiant")).login(data.get("identifiant")))
+
+        account = self.server.tokens.get(data.get("token"))
+        if account is None:
+            return self._send({"code": 525, "message": "Token invalide !", "data": {}})
+
+        self._send(self._route(account, path, query, data))
+
+    def _route(self, account, path, query, data):
+        if match(r"eleves/\d+/notes\.awp", path):
+            return _ok(account.notes())
+        if match(r"eleves/\d+/messages\.awp", path):
+            if query.get("verbe") == "put":
+                account.messageAction(**{k: v for k, v in data.items() if k != "token"})
+                return _ok({})
+            return _ok(account.messageList())
+        if m := match(r"Eleves/\d+/cahierdetexte/([\d-]+)\.awp", path):
+            return _ok(account.homeworksForDay(m[1]))
+        if match(r"Eleves/\d+/cahierdetexte\.awp", path):
+            return _ok(account.homeworks())
+        if match(r"eleves/\d+/viescolaire\.awp", path):
+            return _ok(account.schoolLife())
+        if path == "elevesDocuments.awp":
+            return _ok(account.documents())
+        if path == "comptes/detail.awp":
+            return _ok(account.moneyData())
+        if match(r"E/\d+/espacestravail\.awp", path):
+            return _ok(account.workspaces())
+        if match(r"cloud/[EW]/\d+\.awp", path):
+            folder = account.cloud(query.get("idFolder", ""))
+            if folder is not None:
+                return _ok(folder)
+        return {"code": 404, "message": "Not found", "data": {}}
+
+    def _download(self, form):
+        account = self.server.tokens.get(form.get("token"))
+        if account is None:
+            return self._send({"code": 525, "message": "Token invalide !", "data": {}})
+
+        content = (form.get("fichierId", "") * account.fileSize).encode("utf8")[:account.fileSize]
+        offset = 0
+        if m := match(r"bytes=(\d+)-", self.headers.get("Range", "")):
+            offset = int(m[1])
+            if offset >= len(content):
+                return self._send(b"", 416, "text/plain", {"Content-Range": f"bytes */{len(content)}"})
+            self.send_response(206)
+        else:
+            self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(len(content) - offset))
+        self.end_headers()
+        self.wfile.write(content[offset:])
+
+
+def main():
+    parser = ArgumentParser(description="Local stand-in for the EcoleDirecte API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--messages", type=int, default=100)
+    parser.add_argument("--folders", type=int, default=20)
+    parser.add_argument("--subjects", type=int, default=10)
+    parser.add_argument("--file-size", type=int, default=10 * 1024)
+    args = parser.parse_args()
+
+    server = FakeServer((args.host, args.port), messages=args.messages, folders=args.folders,
+                        subjects=args.subjects, fileSize=args.file_size)
+    print(f"Serving on {server.apiUrl}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
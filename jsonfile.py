@@ -0,0 +1,25 @@
+from json import load, dump
+from os import O_CREAT, O_TRUNC, O_WRONLY, fdopen, getpid, open as openFile, remove, replace
+from threading import get_ident
+
+
+def readJSON(path: str, default=None):
+    try:
+        with open(path) as f:
+            return load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def writeJSON(path: str, data, mode: int = 0o666):
+    tmp = f"{path}.{getpid()}.{get_ident()}.tmp"
+    try:
+        with fdopen(openFile(tmp, O_WRONLY | O_CREAT | O_TRUNC, mode), "w") as f:
+            dump(data, f)
+        replace(tmp, path)
+    except BaseException:
+        try:
+            remove(tmp)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,90 @@
+from re import sub
+from threading import Lock
+from time import perf_counter
+from urllib.parse import urlparse, parse_qs
+
+from transport import API_URL
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+def endpointName(url: str):
+    path = url.split("?")[0]
+    if path.startswith(API_URL):
+        path = path[len(API_URL):]
+    return sub(r"(?<=/)[\d-]+(?=\.awp$|/)", "{id}", path)
+
+
+class RequestEvent:
+    def __init__(self, url: str):
+        self.url = url
+        self.endpoint = endpointName(url)
+        self.verb = parse_qs(urlparse(url).query).get("verbe", [None])[0]
+        self.start = perf_counter()
+        self.latency = None
+        self.status = None
+        self.size = 0
+        self.error = None
+        self.errorCode = None
+
+    def __repr__(self):
+        return f"<{self.__module__}.{self.__class__.__name__} {self.endpoint} {self.verb} {self.status} " \
+               f"{self.size}B ({(self.latency or 0) * 1000:.0f}ms)>"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels):
+    return ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+
+
+class Metrics:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.requests = {}
+        self.errors = {}
+        self.bytes = {}
+        self.latency = {}
+        self._lock = Lock()
+
+    def __call__(self, event: RequestEvent):
+        with self._lock:
+            key = (event.endpoint, event.verb, event.status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+
+            self.bytes[event.endpoint] = self.bytes.get(event.endpoint, 0) + event.size
+
+            if event.error is not None:
+                key = (event.endpoint, event.errorCode if event.errorCode is not None else type(event.error).__name__)
+                self.errors[key] = self.errors.get(key, 0) + 1
+
+            counts, total = self.latency.get(event.endpoint, ([0] * (len(self.buckets) + 1), 0.))
+            for i, b in enumerate(self.buckets + (float("inf"),)):
+                if event.latency <= b:
+                    counts[i] += 1
+            self.latency[event.endpoint] = (counts, total + event.latency)
+
+    def toPrometheus(self, prefix: str = "ecoledirecte"):
+        with self._lock:
+            lines = [f"# TYPE {prefix}_requests_total counter"]
+            for (endpoint, verb, status), n in sorted(self.requests.items(), key=str):
+                lines.append(f"{prefix}_requests_total{{{_labels(endpoint=endpoint, verb=verb, status=status)}}} {n}")
+
+            lines.append(f"# TYPE {prefix}_errors_total counter")
+            for (endpoint, code), n in sorted(self.errors.items(), key=str):
+                lines.append(f"{prefix}_errors_total{{{_labels(endpoint=endpoint, code=code)}}} {n}")
+
+            lines.append(f"# TYPE {prefix}_response_bytes_total counter")
+            for endpoint, n in sorted(self.bytes.items()):
+                lines.append(f"{prefix}_response_bytes_total{{{_labels(endpoint=endpoint)}}} {n}")
+
+            lines.append(f"# TYPE {prefix}_request_seconds histogram")
+            for endpoint, (counts, total) in sorted(self.latency.items()):
+                for b, n in zip(self.buckets + ("+Inf",), counts):
+                    lines.append(f"{prefix}_request_seconds_bucket{{{_labels(endpoint=endpoint, le=b)}}} {n}")
+                lines.append(f"{prefix}_request_seconds_sum{{{_labels(endpoint=endpoint)}}} {total}")
+                lines.append(f"{prefix}_request_seconds_count{{{_labels(endpoint=endpoint)}}} {counts[-1]}")
+
+        return "\n".join(lines) + "\n"
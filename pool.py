@@ -0,0 +1,123 @@
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from inspect import signature
+from threading import Lock
+from time import perf_counter
+
+from ecoledirecte import Session
+from transport import Transport, RateLimiter
+
+DEFAULT_ENDPOINTS = ("getNotes", "getHomeworks", "getMessages", "getSchoolLife")
+
+
+def _endpoint(endpoint):
+    name, args = (endpoint, ()) if isinstance(endpoint, str) else (endpoint[0], tuple(endpoint[1]))
+    if not name.startswith("get") or not hasattr(Session, name):
+        raise ValueError(f"Unknown endpoint {name!r}")
+    try:
+        signature(getattr(Session, name)).bind(None, *args)
+    except TypeError as e:
+        raise ValueError(f"Bad arguments for endpoint {name!r}: {e}") from None
+    return name, args
+
+
+class FetchResult:
+    def __init__(self, username, endpoint, value=None, error=None, latency=0.):
+        self.username = username
+        self.endpoint = endpoint
+        self.value = value
+        self.error = error
+        self.latency = latency
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        return f"<{self.__module__}.{self.__class__.__name__} {self.username} {self.endpoint} " \
+               f"{'ok' if self.ok else repr(self.error)} ({self.latency * 1000:.0f}ms)>"
+
+
+class AccountReport:
+    def __init__(self, username):
+        self.username = username
+        self.latency = 0.
+        self.requests = 0
+        self.errors = []
+
+    def add(self, result: FetchResult):
+        self.latency += result.latency
+        self.requests += 1
+        if not result.ok:
+            self.errors.append(result)
+
+    def __repr__(self):
+        return f"<{self.__module__}.{self.__class__.__name__} {self.username} {self.requests} requests " \
+               f"{len(self.errors)} errors ({self.latency * 1000:.0f}ms)>"
+
+
+class SessionPool:
+    def __init__(self, credentials, workers: int = 8, transport: Transport = None, rateLimit: float = None):
+        self.credentials = list(credentials)
+        self.workers = workers
+        self._ownTransport = transport is None
+        self.transport = transport or Transport(poolSize=workers,
+                                                rateLimit=RateLimiter(rateLimit, workers) if rateLimit else None)
+        self.sessions = {}
+        self.reports = {}
+        self._lock = Lock()
+
+    def _login(self, username, password):
+        if username not in self.sessions:
+            self.sessions[username] = Session(username, password, self.transport)
+        return self.sessions[username]
+
+    def _call(self, username, endpoint, function, *args):
+        start = perf_counter()
+        try:
+            value = function(*args)
+        except Exception as e:
+            result = FetchResult(username, endpoint, error=e, latency=perf_counter() - start)
+        else:
+            result = FetchResult(username, endpoint, value, latency=perf_counter() - start)
+
+        with self._lock:
+            self.reports.setdefault(username, AccountReport(username)).add(result)
+
+        return result
+
+    def fetch(self, endpoints=DEFAULT_ENDPOINTS):
+        endpoints = [_endpoint(e) for e in endpoints]
+
+        with ThreadPoolExecutor(self.workers) as executor:
+            pending = {executor.submit(self._call, username, "login", self._login, username, password)
+                       for username, password in self.credentials}
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    if result.endpoint == "login":
+                        if not result.ok:
+                            yield result
+                            continue
+                        for name, args in endpoints:
+                            pending.add(executor.submit(self._call, result.username, name,
+                                                        getattr(result.value, name), *args))
+                    else:
+                        yield result
+
+    def close(self):
+        if self._ownTransport:
+            self.transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def bulkFetch(credentials, endpoints=DEFAULT_ENDPOINTS, workers: int = 8, rateLimit: float = None,
+              transport: Transport = None):
+    with SessionPool(credentials, workers, transport, rateLimit) as pool:
+        yield from pool.fetch(endpoints)
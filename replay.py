@@ -0,0 +1,137 @@
+from base64 import b64encode, b64decode
+from hashlib import sha256
+from json import loads, dumps
+from os import makedirs
+from os.path import join
+from re import sub
+from threading import Lock
+from urllib.parse import unquote_plus
+
+from jsonfile import readJSON, writeJSON
+from transport import API_URL
+
+
+def _redact(data):
+    if isinstance(data, bytes):
+        data = data.decode("utf8")
+    data = sub(r'"token"\s*:\s*"[^"]*"', '"token":"<token>"', data)
+    data = sub(r'"motdepasse"\s*:\s*"(?:[^"\\]|\\.)*"', '"motdepasse":"<password>"', data)
+    return sub(r"(?<=token=)[^&]*", "<token>", data)
+
+
+def requestKey(url: str, data):
+    url = url[len(API_URL):] if url.startswith(API_URL) else url
+    if isinstance(data, bytes):
+        data = data.decode("utf8")
+    return url + "\n" + _redact(unquote_plus(data))
+
+
+class RecordedResponse:
+    def __init__(self, status, headers, content):
+        self.status_code = status
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self):
+        return self.content.decode("utf8")
+
+    def json(self):
+        return loads(self.content)
+
+    def iter_content(self, chunkSize=1):
+        for i in range(0, len(self.content), chunkSize):
+            yield self.content[i:i + chunkSize]
+
+    def raise_for_status(self):
+        pass
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+class _Recordings:
+    def __init__(self, directory):
+        self.directory = directory
+        self._lock = Lock()
+
+    def path(self, key):
+        return join(self.directory, sha256(key.encode("utf8")).hexdigest()[:32] + ".json")
+
+    def read(self, key):
+        recording = readJSON(self.path(key))
+        return None if recording is None else recording["responses"]
+
+    def append(self, key, response):
+        with self._lock:
+            responses = self.read(key) or []
+            responses.append(response)
+            writeJSON(self.path(key), {"key": key, "responses": responses})
+
+
+class RecordingTransport:
+    def __init__(self, transport, directory: str):
+        self.transport = transport
+        self.directory = directory
+        self._recordings = _Recordings(directory)
+        makedirs(directory, exist_ok=True)
+
+    def post(self, url: str, data, headers: dict = None, stream: bool = False):
+        r = self.transport.post(url, data, headers=headers, stream=stream)
+        content = stored = r.content
+        contentType = r.headers.get("Content-Type", "")
+        if "json" in contentType:
+            stored = _redact(content).encode("utf8")
+
+        self._recordings.append(requestKey(url, data), {
+            "status": r.status_code,
+            "headers": {"Content-Type": contentType, "Content-Length": str(len(stored))},
+            "content": b64encode(stored).decode("ascii"),
+        })
+        return RecordedResponse(r.status_code, dict(r.headers), content)
+
+    def close(self):
+        self.transport.close()
+
+    def __repr__(self):
+        return f"<{self.__module__}.{self.__class__.__name__} {self.directory}>"
+
+
+class ReplayTransport:
+    def __init__(self, directory: str, strict: bool = True):
+        self.directory = directory
+        self.strict = strict
+        self._recordings = _Recordings(directory)
+        self._positions = {}
+        self._lock = Lock()
+
+    def post(self, url: str, data, headers: dict = None, stream: bool = False):
+        key = requestKey(url, data)
+        responses = self._recordings.read(key)
+        if not responses:
+            if self.strict:
+                raise KeyError(f"No recorded response for {key.splitlines()[0]!r}")
+            return RecordedResponse(404, {}, dumps({"code": 404, "message": "Not recorded"}).encode("utf8"))
+
+        with self._lock:
+            i = self._positions.get(key, 0)
+            self._positions[key] = i + 1
+
+        r = responses[min(i, len(responses) - 1)]
+        return RecordedResponse(r["status"], r["headers"], b64decode(r["content"]))
+
+    def rewind(self):
+        with self._lock:
+            self._positions = {}
+
+    def close(self):
+        pass
+
+    def __repr__(self):
+        return f"<{self.__module__}.{self.__class__.__name__} {self.directory}>"
@@ -0,0 +1,241 @@
+import sqlite3
+from threading import Lock
+from time import time
+
+from codec import decode, encode
+from ecoledirecte import (IdentityMap, NoteList, Note, Period, MessageList, Compte, PersonalCloud, ClassCloud,
+                          CloudRoot)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS periods (
+    account INTEGER NOT NULL, name TEXT NOT NULL, position INTEGER, data TEXT, saved REAL,
+    PRIMARY KEY (account, name)
+);
+CREATE TABLE IF NOT EXISTS notes (
+    account INTEGER NOT NULL, period TEXT NOT NULL, subject TEXT NOT NULL, position INTEGER, note REAL, data TEXT,
+    saved REAL,
+    PRIMARY KEY (account, period, subject)
+);
+CREATE INDEX IF NOT EXISTS notes_subject ON notes (account, subject);
+CREATE TABLE IF NOT EXISTS messages (
+    account INTEGER NOT NULL, folder TEXT NOT NULL, id INTEGER NOT NULL, position INTEGER, date TEXT, read INTEGER,
+    data TEXT, saved REAL,
+    PRIMARY KEY (account, folder, id)
+);
+CREATE INDEX IF NOT EXISTS messages_folder ON messages (account, folder, position);
+CREATE INDEX IF NOT EXISTS messages_date ON messages (account, date);
+CREATE TABLE IF NOT EXISTS comptes (
+    account INTEGER NOT NULL, id INTEGER NOT NULL, position INTEGER, money REAL, name TEXT, saved REAL,
+    PRIMARY KEY (account, id)
+);
+CREATE TABLE IF NOT EXISTS compte_logs (
+    account INTEGER NOT NULL, compte INTEGER NOT NULL, position INTEGER NOT NULL, date TEXT, money REAL, name TEXT,
+    saved REAL,
+    PRIMARY KEY (account, compte, position)
+);
+CREATE INDEX IF NOT EXISTS compte_logs_date ON compte_logs (account, date);
+CREATE TABLE IF NOT EXISTS cloud_nodes (
+    account INTEGER NOT NULL, cloud TEXT NOT NULL, type TEXT NOT NULL, id TEXT NOT NULL, parent TEXT, position INTEGER,
+    name TEXT, size INTEGER, loaded INTEGER, saved REAL,
+    PRIMARY KEY (account, cloud, type, id)
+);
+CREATE INDEX IF NOT EXISTS cloud_nodes_parent ON cloud_nodes (account, cloud, parent, position);
+"""
+
+TABLES = ("periods", "notes", "messages", "comptes", "compte_logs", "cloud_nodes")
+
+
+def _fromFloat(value):
+    return "" if value is None else str(value).replace(".", ",")
+
+
+def _periodData(p):
+    return {"periode": p.name, "dateDebut": p.start, "dateFin": p.stop, "dateConseil": p.dateCouncil,
+            "heureConseil": p.timeCouncil, "ensembleMatieres": {
+                "moyenneGenerale": _fromFloat(p.moyenne), "moyenneClasse": _fromFloat(p.moyenneClass),
+                "moyenneMin": _fromFloat(p.moyenneClassMin), "moyenneMax": _fromFloat(p.moyenneClassMax),
+                "nomPP": p.headTeacher.fullname, "appreciationPP": p.appreciationHeadTeacher, "disciplines": []}}
+
+
+def _cloudKey(cloud):
+    return "W/" + str(cloud.cloudId) if isinstance(cloud, ClassCloud) else "E"
+
+
+def _cloudRows(cloud, folder, position=0):
+    yield (_cloudKey(cloud), "folder" if folder.folder else "file", str(folder.id),
+           None if folder.parent is None else str(folder.parent.id), position, folder.name, folder.size,
+           int(folder.isLoaded) if folder.folder else None)
+
+    if folder.folder:
+        for i, c in enumerate(folder.children):
+            yield from _cloudRows(cloud, c, i)
+
+
+class StoredAccount:
+    def __init__(self, id):
+        self.id = id
+        self.people = IdentityMap()
+
+    def __repr__(self):
+        return f"<{self.__module__}.{self.__class__.__name__} {self.id}>"
+
+
+class Store:
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = Lock()
+        if path != ":memory:":
+            self._db.execute("PRAGMA journal_mode=WAL")
+        if "path" in [c[1] for c in self._db.execute("PRAGMA table_info(cloud_nodes)")]:
+            self._db.execute("DROP TABLE cloud_nodes")
+        self._db.executescript(SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _upsert(self, table, rows, account, saved):
+        rows = [(account, *r, saved) for r in rows]
+        if rows:
+            self._db.executemany(f"INSERT OR REPLACE INTO {table} VALUES ({', '.join('?' * len(rows[0]))})", rows)
+
+    def _sweep(self, table, account, saved, where="", args=()):
+        self._db.execute(f"DELETE FROM {table} WHERE account = ? AND saved != ?{where}", (account, saved, *args))
+
+    def save(self, account: int, notes=None, messages=None, comptes=None, clouds=()):
+        saved = time()
+        with self._lock, self._db:
+            if notes is not None:
+                periods = {}
+                for n in notes:
+                    periods.setdefault(n.period.name, n.period)
+
+                self._upsert("periods", ((name, i, encode(_periodData(p))) for i, (name, p) in
+                                         enumerate(periods.items())), account, saved)
+                raw = {p.name: {d["discipline"]: d for d in p.data} for p in periods.values()}
+                self._upsert("notes", ((n.period.name, n.subject, i, n.note, encode(raw[n.period.name][n.subject]))
+                                       for i, n in enumerate(notes)), account, saved)
+                self._sweep("periods", account, saved)
+                self._sweep("notes", account, saved)
+
+            if messages is not None:
+                self._upsert("messages", ((folder, m["id"], i, m["date"], int(m["read"]), encode(m))
+                                          for folder, ms in messages.data.items() for i, m in enumerate(ms)),
+                             account, saved)
+                self._sweep("messages", account, saved)
+
+            if comptes is not None:
+                self._upsert("comptes", ((c.id, i, c.money, c.name) for i, c in enumerate(comptes)), account, saved)
+                self._upsert("compte_logs", ((c.id, i, l.date, l.money, l.name) for c in comptes
+                                             for i, l in enumerate(c.logs)), account, saved)
+                self._sweep("comptes", account, saved)
+                self._sweep("compte_logs", account, saved)
+
+            for cloud in clouds:
+                self._upsert("cloud_nodes", _cloudRows(cloud, cloud), account, saved)
+                self._sweep("cloud_nodes", account, saved, " AND cloud = ?", (_cloudKey(cloud),))
+
+    def saveSession(self, session, clouds: bool = False):
+        data = {"notes": session.getNotes(), "messages": session.getMessages(), "comptes": session.getMoneyData()}
+        if clouds:
+            data["clouds"] = [session.getPersonalCloud().loadAll()] + \
+                             [c.get().loadAll() for c in session.getClouds()]
+        self.save(session.id, **data)
+
+    def delete(self, account: int):
+        with self._lock, self._db:
+            for table in TABLES:
+                self._db.execute(f"DELETE FROM {table} WHERE account = ?", (account,))
+
+    def _query(self, sql, args):
+        with self._lock:
+            return self._db.execute(sql, args).fetchall()
+
+    def accounts(self):
+        return [r[0] for r in self._query("SELECT DISTINCT account FROM periods UNION "
+                                          "SELECT DISTINCT account FROM messages UNION "
+                                          "SELECT DISTINCT account FROM comptes ORDER BY 1", ())]
+
+    def getNotes(self, account: int, subject: str = None, period: str = None, session=None):
+        session = session or StoredAccount(account)
+        where, args = "", [account]
+        if subject is not None:
+            where += " AND n.subject = ?"
+            args.append(subject)
+        if period is not None:
+            where += " AND n.period = ?"
+            args.append(period)
+
+        periods = {}
+        result = []
+        for name, periodData, data in self._query(
+                "SELECT p.name, p.data, n.data FROM notes n JOIN periods p ON p.account = n.account AND p.name = n.period "
+                "WHERE n.account = ?" + where + " ORDER BY n.position", args):
+            p = periods.get(name)
+            if p is None:
+                p = periods[name] = Period(decode(periodData))
+            data = decode(data)
+            p.data.append(data)
+            result.append(Note(data, p, session.people))
+
+        return NoteList(result)
+
+    def getMessages(self, account: int, folder: str = None, session=None):
+        where, args = "", [account]
+        if folder is not None:
+            where, args = " AND folder = ?", [account, folder]
+
+        data = {}
+        for f, m in self._query("SELECT folder, data FROM messages WHERE account = ?" + where +
+                                " ORDER BY folder, position", args):
+            data.setdefault(f, []).append(decode(m))
+
+        return MessageList(session or StoredAccount(account), data)
+
+    def getMoneyData(self, account: int):
+        logs = {}
+        for compte, date, money, name in self._query(
+                "SELECT compte, date, money, name FROM compte_logs WHERE account = ? ORDER BY compte, position",
+                (account,)):
+            logs.setdefault(compte, []).append({"date": date, "montant": money, "libelle": name})
+
+        return [Compte({"id": id, "solde": money, "libelle": name, "ecritures": logs.get(id, [])})
+                for id, money, name in self._query(
+                    "SELECT id, money, name FROM comptes WHERE account = ? ORDER BY position", (account,))]
+
+    def getCloud(self, account: int, cloudId: int = None, session=None) -> CloudRoot:
+        cloud = "E" if cloudId is None else "W/" + str(cloudId)
+        folders = {}
+        nodes = []
+        root = None
+        for type, id, parent, name, size, loaded in self._query(
+                "SELECT type, id, parent, name, size, loaded FROM cloud_nodes WHERE account = ? AND cloud = ? "
+                "ORDER BY position", (account, cloud)):
+            node = {"type": type, "libelle": name, "taille": size, "id": id}
+            if type == "folder":
+                node.update(isLoaded=bool(loaded), children=[])
+                folders[id] = node
+            if parent is None:
+                root = node
+            else:
+                nodes.append((parent, node))
+
+        for parent, node in nodes:
+            folders[parent]["children"].append(node)
+
+        if root is None:
+            return None
+
+        session = session or StoredAccount(account)
+        if cloudId is None:
+            return PersonalCloud(session, [root])
+        return ClassCloud(session, cloudId, [root])
+
+    def __repr__(self):
+        return f"<{self.__module__}.{self.__class__.__name__} {self.path}>"
@@ -0,0 +1,60 @@
+from ecoledirecte import Message
+from jsonfile import readJSON, writeJSON
+
+
+class SyncResult:
+    def __init__(self):
+        self.new = []
+        self.changed = []
+        self.removed = []
+
+    def __bool__(self):
+        return bool(self.new or self.changed or self.removed)
+
+    def __repr__(self):
+        return f"<{self.__module__}.{self.__class__.__name__} {len(self.new)} new, {len(self.changed)} changed, " \
+               f"{len(self.removed)} removed>"
+
+
+class MessageSync:
+    def __init__(self, session, path: str):
+        self.session = session
+        self.path = path
+        self.messages = {}
+
+        state = readJSON(path)
+        if state is not None and state["account"] == session.id:
+            self.messages = state["messages"]
+
+    def save(self):
+        writeJSON(self.path, {"account": self.session.id, "messages": self.messages})
+
+    def reset(self):
+        self.messages = {}
+
+    def sync(self, save: bool = True):
+        data = self.session._get("messages", refresh=True)["messages"]
+        result = SyncResult()
+        seen = set()
+
+        for folder, messages in data.items():
+            for m in messages:
+                key = str(m["id"])
+                seen.add(key)
+                known = self.messages.get(key)
+
+                if known is None:
+                    result.new.append(Message(self.session, folder, m))
+                elif known != [folder, m["read"]]:
+                    result.changed.append(Message(self.session, folder, m))
+
+                self.messages[key] = [folder, m["read"]]
+
+        for key in [k for k in self.messages if k not in seen]:
+            del self.messages[key]
+            result.removed.append(int(key))
+
+        if save:
+            self.save()
+
+        return result
@@ -0,0 +1,22 @@
+import sys
+from os.path import dirname, abspath
+
+import pytest
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+from ecoledirecte import Session
+from fakeserver import FakeServer
+from transport import Transport
+
+
+@pytest.fixture
+def server():
+    with FakeServer() as server:
+        yield server
+
+
+@pytest.fixture
+def session(server):
+    with Session("eleve", "secret", transport=Transport(apiUrl=server.apiUrl)) as session:
+        yield session
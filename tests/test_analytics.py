@@ -0,0 +1,45 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import analytics
+from ecoledirecte import Session
+from transport import Transport
+
+
+@pytest.fixture
+def sessions(server):
+    with Session("eleve1", "a", transport=Transport(apiUrl=server.apiUrl)) as first, \
+            Session("eleve2", "b", transport=Transport(apiUrl=server.apiUrl)) as second:
+        yield first, second
+
+
+def _average(notes):
+    graded = [n for n in notes if n.note is not None]
+    return sum(n.note * n.coef for n in graded) / sum(n.coef for n in graded)
+
+
+def testCollectedAverages(sessions):
+    a = analytics.collect(sessions)
+
+    assert len(a) == sum(len(s.getNotes()) for s in sessions)
+    averages = analytics.weightedAverages(a)
+    assert averages["account"].tolist() == [s.id for s in sessions]
+    assert averages["average"] == pytest.approx([_average(s.getNotes()) for s in sessions])
+
+
+def testRankingPercentilesAndTrends(sessions):
+    a = analytics.collect(sessions)
+
+    ranking = analytics.subjectRanking(a)
+    for subject in np.unique(ranking["subject"]):
+        rows = ranking[ranking["subject"] == subject]
+        assert sorted(rows["rank"]) == [1, 2]
+        assert rows["average"][rows["rank"] == 1][0] >= rows["average"][rows["rank"] == 2][0]
+
+    p = analytics.percentiles(a)
+    assert np.all((p >= 0) & (p <= 100))
+
+    trends = analytics.trends(a)
+    assert len(trends) == 2 * 10
+    assert set(trends["periods"]) == {3}
@@ -0,0 +1,105 @@
+import asyncio
+import os
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from asyncsession import AsyncSession, AsyncTransport
+from errors import APIError, DownloadError, EcoleDirecteError
+
+
+def _state(messages):
+    return {f: {m["id"]: m["read"] for m in ms} for f, ms in messages.data.items()}
+
+
+def _run(server, test):
+    async def main():
+        transport = AsyncTransport(apiUrl=server.apiUrl)
+        try:
+            await test(await AsyncSession.login("eleve", "secret", transport))
+        finally:
+            await transport.close()
+
+    asyncio.run(main())
+
+
+def testMessageActions(server):
+    async def test(session):
+        messages = await session.getMessages()
+        message = messages.folders["received"][0]
+        await message.markAsRead()
+        await message.archive()
+        await messages.markAsUnread(messages.folders["received"][:5])
+
+        assert (message.read, message.folder) == (True, "archived")
+        assert _state(await session.getMessages()) == _state(messages)
+
+    _run(server, test)
+
+
+def testDownload(server, tmp_path):
+    async def test(session):
+        attachment = next(a for m in await session.getMessages() for a in m.attachements)
+        filename = await attachment.download(str(tmp_path / "piece.pdf"))
+        assert os.path.getsize(filename) == 10 * 1024
+
+        server.tokens.clear()
+        await attachment.download(str(tmp_path / "renewed.pdf"))
+
+        expired = AsyncSession.restore({**session.dump(), "token": "expired"}, session.transport)
+        with pytest.raises(DownloadError):
+            await expired.download(attachment.fileType, attachment.id, str(tmp_path / "other.pdf"))
+        assert sorted(os.listdir(tmp_path)) == ["piece.pdf", "renewed.pdf"]
+
+    _run(server, test)
+
+
+def testRestoredSessionRenewsToken(server):
+    async def test(session):
+        state = {**session.dump(), "token": "expired"}
+        server.tokens.clear()
+
+        restored = AsyncSession.restore(state, session.transport, "eleve", "secret")
+        days = await restored.getHomeworksRange("2021-09-01", "2021-09-07")
+        assert len(days) == 7
+        assert restored.token == session.token
+
+        with pytest.raises(APIError):
+            await AsyncSession.restore(state, session.transport).getNotes()
+
+    _run(server, test)
+
+
+def testCloudNeedsAsyncLoading(server):
+    async def test(session):
+        cloud = await session.getPersonalCloud()
+        with pytest.raises(EcoleDirecteError, match="loadAll"):
+            cloud.tree()
+
+        await session.loadAll(cloud)
+        path = cloud.children[0].getPath()
+        assert cloud.getFileByPath(path) is cloud.children[0]
+        assert cloud.tree()
+
+    _run(server, test)
+
+
+def testHomeworksRangeIsBounded(server):
+    async def test(session):
+        active = [0, 0]
+
+        def before(event):
+            active[0] += 1
+            active[1] = max(active)
+
+        def after(event):
+            active[0] -= 1
+
+        session.addHook(after, before)
+        days = await session.getHomeworksRange("2021-09-01", "2021-09-20", workers=3)
+
+        assert len(days) == 20
+        assert active[1] == 3
+
+    _run(server, test)
@@ -0,0 +1,39 @@
+import os
+import stat
+
+from cache import DiskCache, MemoryCache, TokenStore
+
+
+def testMemoryCacheStoresCopies():
+    cache = MemoryCache()
+    value = {"items": [1]}
+    cache.set("key", value, 60)
+    value["items"].append(2)
+    cache.get("key")["items"].append(3)
+
+    assert cache.get("key") == {"items": [1]}
+
+
+def testDiskCacheExpiredEntryAlreadyRemoved(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    cache.set("key", 1, -1)
+    path = cache._path("key")
+    os.remove(path)
+    cache.set("key", 1, -1)
+
+    assert cache.get("key") is None
+    assert cache.get("key") is None
+
+
+def testTokenStoreIsPrivate(tmp_path):
+    directory = tmp_path / "tokens"
+    store = TokenStore(str(directory))
+    store.set("eleve", "secret", {"token": "t"})
+
+    assert TokenStore(str(directory)).get("eleve", "secret") == {"token": "t"}
+    assert stat.S_IMODE(os.stat(directory).st_mode) == 0o700
+    for name in os.listdir(directory):
+        assert stat.S_IMODE(os.stat(directory / name).st_mode) == 0o600
+
+    other = TokenStore(str(tmp_path / "other"))
+    assert os.path.basename(other._path("eleve", "secret")) != os.path.basename(store._path("eleve", "secret"))
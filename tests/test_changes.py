@@ -0,0 +1,32 @@
+from changes import ChangeFeed
+from fakeserver import SyntheticAccount
+
+
+class _SharedIdAccount(SyntheticAccount):
+    def schoolLife(self):
+        r = super().schoolLife()
+        for item in r["absencesRetards"]:
+            item["id"] = 7 if item["id"] < 2 else item["id"]
+        return r
+
+
+def testPollReportsChangesSinceLastSave(server, session, tmp_path):
+    path = str(tmp_path / "feed.json")
+    first = ChangeFeed(session, path).poll()
+    assert first and {c.kind for c in first} == {"added"}
+
+    account = server.accounts["eleve"]
+    account.absences -= 1
+    account.ecritures += 1
+
+    changes = ChangeFeed(session, path).poll()
+    assert {(c.kind, c.category) for c in changes} == {("removed", "schoolLife"), ("added", "money")}
+    assert ChangeFeed(session, path).poll() == []
+
+
+def testAbsenceAndRetardWithSameId(server, session):
+    server.tokens[session.token] = server.accounts["eleve"] = _SharedIdAccount()
+    feed = ChangeFeed(session)
+
+    assert len(feed.poll(["schoolLife"])) == 10
+    assert feed.poll(["schoolLife"]) == []
@@ -0,0 +1,116 @@
+import os
+
+import pytest
+
+from cache import DownloadCache
+from downloads import DownloadManager
+from ecoledirecte import Attachment, Session
+from errors import DownloadError
+from fakeserver import SyntheticAccount
+from transport import Transport
+
+
+def _attachment(session):
+    return next(a for m in session.getMessages() for a in m.attachements)
+
+
+def testDownloadRenewsExpiredToken(server, session, tmp_path):
+    server.tokens.clear()
+    filename = _attachment(session).download(str(tmp_path / "piece.pdf"))
+
+    assert os.path.getsize(filename) == 10 * 1024
+
+
+def testDownloadErrorLeavesNoFile(server, tmp_path):
+    state = Session("eleve", "secret", transport=Transport(apiUrl=server.apiUrl)).dump()
+    state["token"] = "expired"
+    with Session(state=state, transport=Transport(apiUrl=server.apiUrl)) as session:
+        with pytest.raises(DownloadError):
+            session.download("PIECE_JOINTE", 1, str(tmp_path / "piece.pdf"))
+
+    assert os.listdir(tmp_path) == []
+
+
+def testResumeCompleteDownload(session, tmp_path):
+    filename = str(tmp_path / "piece.pdf")
+    with open(filename + ".part", "wb") as f:
+        f.write(b"x" * 10 * 1024)
+
+    assert session.download("PIECE_JOINTE", 1, filename, resume=True) == filename
+    assert os.path.getsize(filename) == 10 * 1024
+    assert not os.path.exists(filename + ".part")
+
+
+def testResumeRestartsStaleDownload(session, tmp_path):
+    filename = str(tmp_path / "piece.pdf")
+    with open(filename + ".part", "wb") as f:
+        f.write(b"x" * 30000)
+
+    session.download("PIECE_JOINTE", 1, filename, resume=True)
+
+    assert os.path.getsize(filename) == 10 * 1024
+    assert not os.path.exists(filename + ".part")
+
+
+def testCachedCopyIgnoresLaterEdits(server, tmp_path):
+    cache = DownloadCache(str(tmp_path / "cache"))
+    with Session("eleve", "secret", transport=Transport(apiUrl=server.apiUrl), downloadCache=cache) as session:
+        attachment = _attachment(session)
+        first = attachment.download(str(tmp_path / "first.pdf"))
+        with open(first, "r+b") as f:
+            f.write(b"edited")
+
+        second = attachment.download(str(tmp_path / "second.pdf"))
+        with open(second, "rb") as f:
+            assert not f.read().startswith(b"edited")
+
+
+@pytest.mark.parametrize("hardLink", [False, True])
+def testCacheHitIgnoresEditsToServedCopy(server, tmp_path, hardLink):
+    cache = DownloadCache(str(tmp_path / "cache"), hardLink=hardLink)
+    with Session("eleve", "secret", transport=Transport(apiUrl=server.apiUrl), downloadCache=cache) as session:
+        attachment = _attachment(session)
+        attachment.download(str(tmp_path / "first.pdf"))
+        second = attachment.download(str(tmp_path / "second.pdf"))
+        assert cache.hits == 1
+        with open(second, "r+b") as f:
+            f.write(b"EDITED")
+
+        third = attachment.download(str(tmp_path / "third.pdf"))
+        with open(third, "rb") as f:
+            assert not f.read().startswith(b"EDITED")
+
+
+def testManagerKeepsFilesInsideDirectory(session, tmp_path):
+    directory = tmp_path / "downloads"
+    items = [Attachment(session, {"id": i, "libelle": name, "date": "2021-01-01"})
+             for i, name in enumerate(("../../evil.pdf", "..", "a/../../b.pdf", "same.pdf", "SAME.pdf"))]
+
+    report = DownloadManager(str(directory), backoff=0).add(*items).run()
+
+    assert not report.failed
+    assert sorted(os.listdir(directory)) == sorted(["SAME (4).pdf", "_", ".._.._evil.pdf", "a_.._.._b.pdf",
+                                                    "same.pdf"])
+    assert sorted(os.listdir(tmp_path)) == ["downloads"]
+
+
+class _DuplicateAccount(SyntheticAccount):
+    def _folder(self, i, depth):
+        folder = super()._folder(i, depth)
+        if i == 0:
+            folder["children"].append({"type": "file", "libelle": "FICHIER 0-0.pdf", "taille": self.fileSize,
+                                       "id": "0-dup"})
+        return folder
+
+
+def testMirrorFindsNewFilesAndSeparatesClashes(server, tmp_path):
+    account = server.accounts["eleve"] = _DuplicateAccount(folders=7, filesPerFolder=3)
+    with Session("eleve", "secret", transport=Transport(apiUrl=server.apiUrl)) as session:
+        cloud = session.getPersonalCloud()
+        first = cloud.mirror(str(tmp_path))
+        assert len(first.downloaded) == 22
+        assert {"fichier 0-0.pdf", "FICHIER 0-0 (0-dup).pdf"} <= set(os.listdir(tmp_path))
+
+        account.filesPerFolder = 4
+        second = cloud.mirror(str(tmp_path))
+        assert (len(second.downloaded), second.unchanged) == (7, 22)
@@ -0,0 +1,56 @@
+import pytest
+
+from cache import DiskCache, ResponseCache
+from ecoledirecte import Session
+from transport import Transport
+
+
+def _state(messages):
+    return {f: {m["id"]: m["read"] for m in ms} for f, ms in messages.data.items()}
+
+
+def testSingleActionUpdatesList(session):
+    messages = session.getMessages()
+    message = messages.folders["received"][0]
+
+    message.archive()
+
+    assert message.folder == "archived"
+    assert message in messages.folders["archived"]
+    assert message not in messages.folders["received"]
+    assert _state(session.getMessages(refresh=True)) == _state(messages)
+
+
+def testUnarchiveRestoresSentMessages(session):
+    messages = session.getMessages()
+    sent = messages.folders["sent"][0]
+    received = messages.folders["received"][0]
+
+    messages.archive([sent, received])
+    messages.unarchive([sent, received])
+
+    assert (sent.folder, received.folder) == ("sent", "received")
+    assert _state(session.getMessages(refresh=True)) == _state(messages)
+
+
+@pytest.mark.parametrize("backend", ["memory", "disk"])
+def testActionsInvalidateResponseCache(server, tmp_path, backend):
+    cache = ResponseCache(DiskCache(str(tmp_path)) if backend == "disk" else None)
+    with Session("eleve", "secret", transport=Transport(apiUrl=server.apiUrl), responseCache=cache) as session:
+        messages = session.getMessages()
+        archived = len(messages.folders["archived"])
+
+        messages.folders["received"][0].archive()
+        messages.archive(messages.folders["received"][:2])
+
+        assert len(session.getMessages().folders["archived"]) == archived + 3
+
+
+def testCachedResponsesAreCopies(server):
+    cache = ResponseCache()
+    with Session("eleve", "secret", transport=Transport(apiUrl=server.apiUrl), responseCache=cache) as session:
+        session.getMessages().folders["received"][0].markAsRead()
+        messages = session.getMessages()
+        messages.data["received"].clear()
+
+        assert session.getMessages().data["received"]
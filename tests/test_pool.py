@@ -0,0 +1,30 @@
+import pytest
+
+from errors import LoginError
+from pool import SessionPool, bulkFetch
+from transport import Transport
+
+
+def testFetchAllAccounts(server):
+    credentials = [("eleve1", "a"), ("eleve2", "b")]
+    with SessionPool(credentials, workers=4, transport=Transport(apiUrl=server.apiUrl)) as pool:
+        results = list(pool.fetch(["getNotes", ("getHomeworksForDay", ("2021-09-01",)), ("getCloud", [1])]))
+
+        assert all(r.ok for r in results)
+        assert sorted((r.username, r.endpoint) for r in results) == sorted(
+            (u, e) for u, _ in credentials for e in ("getNotes", "getHomeworksForDay", "getCloud"))
+        assert {u: r.requests for u, r in pool.reports.items()} == {"eleve1": 4, "eleve2": 4}
+
+
+@pytest.mark.parametrize("endpoint", ["getCloud", "getHomeworksForDay", ("getNotes", (1, 2)), "getNothing", "login"])
+def testRejectBadEndpoints(endpoint):
+    with SessionPool([("eleve", "a")]) as pool, pytest.raises(ValueError):
+        list(pool.fetch([endpoint]))
+
+
+def testBulkFetchUsesTransport(server):
+    transport = Transport(apiUrl=server.apiUrl)
+    results = list(bulkFetch([("eleve", "a"), (None, None)], ["getMoneyData"], transport=transport))
+
+    assert [r.endpoint for r in results if r.ok] == ["getMoneyData"]
+    assert [type(r.error) for r in results if not r.ok] == [LoginError]
@@ -0,0 +1,24 @@
+import os
+
+from ecoledirecte import Session
+from replay import RecordingTransport, ReplayTransport
+from transport import Transport
+
+
+def testRecordingReplaysWithoutSecrets(server, tmp_path):
+    directory = str(tmp_path)
+    recording = RecordingTransport(Transport(apiUrl=server.apiUrl), directory)
+    with Session("eleve", "p+ss&word", transport=recording) as session:
+        notes = session.getNotes()
+        messages = session.getMessages()
+        token = session.token
+
+    for name in os.listdir(directory):
+        with open(os.path.join(directory, name)) as f:
+            content = f.read()
+        assert token not in content
+        assert "p+ss&word" not in content
+
+    with Session("eleve", "p+ss&word", transport=ReplayTransport(directory)) as session:
+        assert [repr(n) for n in session.getNotes()] == [repr(n) for n in notes]
+        assert session.getMessages().data == messages.data
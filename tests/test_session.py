@@ -0,0 +1,81 @@
+import pickle
+import time
+from datetime import date
+
+from cache import ResponseCache
+from ecoledirecte import Session
+from transport import Transport
+
+
+def testCredentialsAreEncoded(server):
+    username, password = "a+b&c=d", "100% s3cret+&"
+    with Session(username, password, transport=Transport(apiUrl=server.apiUrl)) as session:
+        assert session.username == username
+        assert list(server.accounts) == [username]
+
+
+def testRequestRenewsExpiredToken(server, session):
+    server.tokens.clear()
+    assert len(session.getNotes()) == 30
+
+
+def testParallelRequestsShareRenewedToken(server, session):
+    server.tokens.clear()
+    days = session.getHomeworksRange("2021-09-01", "2021-09-30", workers=8)
+
+    assert len(days) == 30
+    assert all(days.values())
+
+
+def testNoteListPickles(session):
+    notes = session.getNotes()
+    notes.bySubject("FRANCAIS")
+
+    copy = pickle.loads(pickle.dumps(notes))
+    assert len(copy.bySubject("FRANCAIS")) == len(notes.bySubject("FRANCAIS"))
+
+    copy.append(copy[0])
+    assert len(copy.bySubject(copy[0].subject)) == len(notes.bySubject(notes[0].subject)) + 1
+
+
+def testNoteListIndexesAreCopies(session):
+    notes = session.getNotes()
+    subject = notes.bySubject("FRANCAIS")
+    count = len(subject)
+
+    subject.append(notes[1])
+    notes.groupBy("subject")["FRANCAIS"].clear()
+    notes.stats().clear()
+
+    assert len(notes.bySubject("FRANCAIS")) == count
+    assert notes.stats()["FRANCAIS"].count == count
+
+
+def testHooksDoNotBreakRequests(session):
+    events = []
+    session.addHook(before=lambda e: time.sleep(0.05))
+    session.addHook(before=lambda e: 1 / 0, after=lambda e: 1 / 0)
+    session.addHook(after=events.append)
+
+    assert len(session.getNotes()) == 30
+    assert events[0].status == 200
+    assert events[0].latency < 0.05
+
+
+def testHomeworkDaysExpire(server):
+    cache = ResponseCache(ttls={"homeworksForDay": 60})
+    with Session("eleve", "secret", transport=Transport(apiUrl=server.apiUrl), responseCache=cache) as session:
+        assert session.homeworkTTL == 60
+
+        day = session.getHomeworksForDay("2021-09-01")
+        assert session.getHomeworksForDay("2021-09-01") is day
+
+        session.homeworkDays["2021-09-01"] = (0, day)
+        assert session.getHomeworksForDay("2021-09-01") is not day
+
+
+def testHomeworkDaysShareDateAndStringKeys(session):
+    day = session.getHomeworksForDay(date(2021, 9, 2))
+
+    assert session.getHomeworksRange("2021-09-01", "2021-09-03")["2021-09-02"] is day
+    assert session.getHomeworksForDay("2021-09-02") is day
@@ -0,0 +1,54 @@
+import sqlite3
+
+from fakeserver import SyntheticAccount
+from store import Store
+
+
+class _DuplicateFolderAccount(SyntheticAccount):
+    def _folder(self, i, depth):
+        folder = super()._folder(i, depth)
+        if i == 0:
+            folder["children"].append({"type": "folder", "libelle": "Dossier 1", "taille": 0, "id": "dup",
+                                       "isLoaded": True, "children": [
+                                           {"type": "file", "libelle": "autre.pdf", "taille": 1, "id": "dup-0"}]})
+        return folder
+
+
+def _tree(folder):
+    return [(c.name, c.id, _tree(c) if c.folder else c.size) for c in folder.children]
+
+
+def testSessionRoundTrip(session):
+    with Store() as store:
+        store.saveSession(session, clouds=True)
+
+        assert store.accounts() == [session.id]
+        assert [repr(n) for n in store.getNotes(session.id)] == [repr(n) for n in session.getNotes()]
+        assert store.getMessages(session.id).data == session.getMessages().data
+        assert [(c.id, c.money, len(c.logs)) for c in store.getMoneyData(session.id)] == \
+               [(c.id, c.money, len(c.logs)) for c in session.getMoneyData()]
+        assert _tree(store.getCloud(session.id)) == _tree(session.getPersonalCloud().loadAll())
+
+        store.delete(session.id)
+        assert store.accounts() == []
+
+
+def testCloudSiblingsWithSameName(server, session):
+    server.tokens[session.token] = server.accounts["eleve"] = _DuplicateFolderAccount()
+    cloud = session.getPersonalCloud()
+
+    with Store() as store:
+        store.save(session.id, clouds=[cloud])
+        stored = store.getCloud(session.id)
+
+    assert _tree(stored) == _tree(cloud)
+    assert [c.id for c in stored.children if c.name == "Dossier 1"] == ["1", "dup"]
+
+
+def testOldCloudTableIsReplaced(tmp_path):
+    path = str(tmp_path / "store.db")
+    with sqlite3.connect(path) as db:
+        db.execute("CREATE TABLE cloud_nodes (account INTEGER, cloud TEXT, path TEXT, PRIMARY KEY (account, cloud, path))")
+
+    with Store(path) as store:
+        assert store.getCloud(1) is None
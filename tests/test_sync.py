@@ -0,0 +1,28 @@
+from sync import MessageSync
+
+
+def testSyncReportsOnlyDifferences(session, tmp_path):
+    path = str(tmp_path / "messages.json")
+    first = MessageSync(session, path).sync()
+    assert len(first.new) == 100 and not first.changed and not first.removed
+
+    assert not MessageSync(session, path).sync()
+
+    messages = session.getMessages()
+    read = messages.getUnread()[0]
+    archived = messages.folders["received"][1]
+    read.markAsRead()
+    archived.archive()
+
+    r = MessageSync(session, path).sync()
+    assert r.new == []
+    assert sorted(m.id for m in r.changed) == sorted({read.id, archived.id})
+    assert r.removed == []
+
+
+def testSyncReportsRemovedMessages(server, session, tmp_path):
+    sync = MessageSync(session, str(tmp_path / "messages.json"))
+    sync.sync()
+    server.accounts["eleve"].messages = 90
+
+    assert sorted(sync.sync().removed) == list(range(91, 101))
@@ -0,0 +1,71 @@
+from threading import Lock
+from time import monotonic, sleep
+
+from requests import Session as HTTPSession
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+API_URL = "https://api.ecoledirecte.com/v3/"
+
+
+class RateLimiter:
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._last = monotonic()
+        self._lock = Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+
+        if wait:
+            sleep(wait)
+
+    def __repr__(self):
+        return f"<{self.__module__}.{self.__class__.__name__} {self.rate}/s>"
+
+
+class Transport:
+    def __init__(self, poolSize: int = 10, timeout=30, retries: int = 3, backoff: float = 0.5, apiUrl: str = None,
+                 headers: dict = None, rateLimit: RateLimiter = None):
+        self.timeout = timeout
+        self.apiUrl = apiUrl
+        self.rateLimit = rateLimit
+
+        retry = Retry(total=retries, backoff_factor=backoff, status_forcelist=(429, 500, 502, 503, 504),
+                      allowed_methods=None, raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=poolSize, pool_maxsize=poolSize, max_retries=retry)
+
+        self.http = HTTPSession()
+        self.http.mount("https://", adapter)
+        self.http.mount("http://", adapter)
+        if headers:
+            self.http.headers.update(headers)
+
+    def url(self, url: str):
+        if self.apiUrl and url.startswith(API_URL):
+            return self.apiUrl + url[len(API_URL):]
+        return url
+
+    def post(self, url: str, data, headers: dict = None, stream: bool = False):
+        if self.rateLimit:
+            self.rateLimit.acquire()
+        return self.http.post(self.url(url), data, headers=headers, stream=stream, timeout=self.timeout)
+
+    def close(self):
+        self.http.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __repr__(self):
+        return f"<{self.__module__}.{self.__class__.__name__} {self.apiUrl or API_URL}>"